@@ -1,6 +1,7 @@
 import asyncio
 import uuid
 import logging
+import time
 from queue import SimpleQueue
 from collections.abc import Iterable
 
@@ -9,6 +10,9 @@ import json
 from bleak import BleakClient
 
 from .Decoder import Decoder
+from .GATTTokenBucket import GATTTokenBucket
+from .MessageQueue import MessageQueue
+from .Message import device_message_types
 
 from .LPF_Devices import *
 
@@ -17,13 +21,16 @@ class BLE_Device():
 	# If there was a level five... unfortunately, too complicated to bother implementing
 	TRACE = False
 
-	message_types = (
+	message_types = device_message_types
+
+	# One of these going missing is a missed event, not a stale reading, so
+	# they're never conflated
+	discrete_message_types = (
 		'event',
 		'info',
 		'error',
 		'device_ready',
 		'connection_request',
-		'property',
 	)
 
 	# ---- Initializations, obviously ----
@@ -35,8 +42,18 @@ class BLE_Device():
 			'primary': '00001624-1212-efde-1623-785feabcd123'
 		}
 		self.packet_decoder = Decoder.decode_payload
+		# Only build the readable string for a message when something looks at it
+		self.lazy_readable = True
+		# Decode notifications through a memoryview so slices don't copy the data
+		# LWP notifications are so short that a memoryview slice costs more than
+		# copying a few bytes, so only worth it for devices sending large packets
+		self.zero_copy_decode = False
 
 		self.logger = logging.getLogger(__name__.split('.')[0])
+		# Checked instead of the logger on every packet.  Stale if the level is
+		# changed other than through BTLego.setLoggingLevel() until refresh_log_level()
+		self.log_debug = False
+		self.refresh_log_level()
 
 		# Integer for LEGO part number, string for Bricklink (usually because part of a larger set)
 		self.part_identifier = None
@@ -46,20 +63,47 @@ class BLE_Device():
 		self.client = None
 		self.connected = False
 
+		# Seconds between GATT writes to a characteristic, after a burst of this many
+		# 10 writes/s is about where the slower hubs start dropping writes, faster ones raise it
 		self.gatt_send_rate_limit = 0.1
+		self.gatt_send_burst = 4
+		self.gatt_send_buckets = {}
+
+		# Latest value wins: a write sent with a coalesce_key replaces a queued,
+		# unsent write with the same key instead of going out after it
+		self.coalesce_gatt_writes = False
+		self.coalesced_gatt_writes = {}		# (characteristic, coalesce_key): newest payload
+		self.gatt_writes_coalesced = 0		# Stale writes that were never sent
 
 		# keep around for... whatever?
 		self.device = None
 		self.address = None
 
-		self.disconnect_callback = lambda bleak_dev: BLE_Device._bleak_disconnect(self, bleak_dev)
+		# Through self, so subclasses can override _bleak_disconnect
+		self.disconnect_callback = lambda bleak_dev: self._bleak_disconnect(bleak_dev)
 		# This is such a fun trick, we'll do it twice.
 		# Give connected devices this function to let them send their own gatt messages
 #		self.gatt_writer = lambda payload: BLE_Device._gatt_send(self, payload)
 		self.gatt_writer = self._gatt_send
 
-		self.message_queue = SimpleQueue()				# Messages to send to callbacks
+		self.message_queue = MessageQueue()				# Messages to send to callbacks
 		self.drainlock_changes_queue = SimpleQueue()	# Changes to those callbacks
+		self._delivery_task = None						# Drains message_queue off the Bleak callback
+
+		# Only queue the raw notification in the Bleak callback and decode it on
+		# a consumer task instead.  Bleak never waits on message processing, at
+		# the cost of a trip through the event loop for every notification
+		self.deferred_decode = False
+		# ( characteristic uuid, data, time.perf_counter() when received )
+		# Replace it before connecting for a different maxsize
+		self.notification_queue = asyncio.Queue(maxsize=1024)
+		# What to do with a notification when notification_queue is full, one of
+		# MessageQueue.overflow_policies.  'block' makes Bleak wait, like it
+		# does without deferred_decode, and the others count notifications_dropped
+		self.notification_overflow_policy = 'block'
+		self.notifications_dropped = 0
+		self._notification_task = None
+		self.notification_lag_max = 0.0					# Longest a notification waited to be decoded, in seconds
 
 		# Message type subscriptions reference count
 		self.BLE_event_subscriptions = {}
@@ -70,8 +114,32 @@ class BLE_Device():
 		# 0: callback function
 		# 1: Tuple of message type subscriptions
 
+		# The same thing indexed the other way around for dispatch
+		# message_type: list of (callback_uuid, callback function, conflate, batch) in registration order
+		self.callback_subscribers = {}
+
+		# Subscriptions that only want the newest message per (type, key, port)
+		self.conflated_subscriptions = set()	# (callback_uuid, message_type)
+		self.messages_conflated = {}			# (callback_uuid, message_type): messages skipped
+
+		# Per callback, so one that's slow or keeps failing can be found
+		self.callback_timeouts = {}				# callback_uuid: seconds before the call is cancelled
+		self.callback_stats = {}				# callback_uuid: {'calls', 'total', 'max', 'errors', 'timeouts'}
+
+		# Subscriptions that get lists of messages instead of one call per message
+		self.batched_subscriptions = {}			# (callback_uuid, message_type): (batch_size, batch_latency)
+		self.callback_batches = {}				# (callback_uuid, message_type): list of messages waiting to be sent
+		self._batch_timers = {}					# (callback_uuid, message_type): asyncio.TimerHandle for batch_latency
+
 		self.lock = asyncio.Lock()			# Connect lock
 		self.drain_lock = asyncio.Lock()	# Draining message_queue
+		# Attaching devices to the port list vs. turning hardware subscriptions
+		# on and off for everything in it.  Never held while calling callbacks,
+		# so the notification handler only ever waits on the other side of that
+		self.port_lock = asyncio.Lock()
+
+	def refresh_log_level(self):
+		self.log_debug = self.logger.isEnabledFor(logging.DEBUG)
 
 	# Override in subclass and call super if you subclass to initialize BLE_event_subscriptions with all available message types
 	def _reset_event_subscription_counters(self):
@@ -90,12 +158,34 @@ class BLE_Device():
 
 		self.logger.info("EVENT SUBS\n"+json.dumps(dict(sorted(self.BLE_event_subscriptions.items())), indent=4))
 		self.logger.info("DEVICE OBJECT REGISTERED CALLBACKS\n"+json.dumps(self.callbacks, indent=4, default=lambda function: '<function callback>'))
+		for callback_uuid, stats in self.callback_stats.items():
+			if stats['calls']:
+				self.logger.info(f'CALLBACK {callback_uuid}: {stats["calls"]} calls, {stats["total"]*1000:.3f}ms total, {stats["max"]*1000:.3f}ms max, {stats["errors"]} errors, {stats["timeouts"]} timeouts')
 		if self.message_queue.qsize():
 			self.logger.info(f'ALERT: {self.message_queue.qsize()} MESSAGE(S) AWAITING DEQUEUE')
+		if self.message_queue.dropped:
+			self.logger.info(f'MESSAGE QUEUE: {self.message_queue.stats()}')
+		for (callback_uuid, message_type), count in self.messages_conflated.items():
+			self.logger.info(f'CONFLATED: {count} {message_type} MESSAGE(S) SKIPPED FOR {callback_uuid}')
+		for (callback_uuid, message_type), messages in self.callback_batches.items():
+			self.logger.info(f'BATCHED: {len(messages)} {message_type} MESSAGE(S) WAITING FOR {callback_uuid}')
+		if self.deferred_decode:
+			self.logger.info(f'NOTIFICATION QUEUE: {self.notification_queue.qsize()} waiting, longest wait {self.notification_lag_max*1000:.3f}ms, {self.notifications_dropped} dropped ({self.notification_overflow_policy})')
 		if self.drainlock_changes_queue.qsize():
 			self.logger.info(f'ALERT: {self.drainlock_changes_queue.qsize()} MESSAGES NEEDING TO BE PROCESSED OFF DRAINLOCK')
 
+		for bucket_name, bucket in self.gatt_send_buckets.items():
+			self.logger.info(f'GATT WRITE PACING {bucket_name}: {bucket.stats()}')
+		if self.gatt_writes_coalesced:
+			self.logger.info(f'GATT WRITES COALESCED: {self.gatt_writes_coalesced}')
+
+		from . import off_bleak_callback_queue_depths
+		for key, depth in off_bleak_callback_queue_depths().items():
+			if isinstance(key, tuple) and key[0] is self:
+				self.logger.info(f'GATT WRITE QUEUE: {depth} WRITE(S) PENDING FOR {key[1]}')
+
 	async def connect(self, device):
+		self.refresh_log_level()
 		async with self.lock:
 			self.logger.info("Connecting to "+str(self.shortname)+"...")
 			self.device = device
@@ -138,6 +228,14 @@ class BLE_Device():
 	async def disconnect(self):
 		async with self.lock:
 			self.connected = False
+			if self._delivery_task and not self._delivery_task.done():
+				self._delivery_task.cancel()
+			if self._notification_task and not self._notification_task.done():
+				self._notification_task.cancel()
+			for timer in self._batch_timers.values():
+				timer.cancel()
+			self._batch_timers = {}
+			self.callback_batches = {}
 			self.logger.info(self.shortname+" has disconnected.")
 
 	def _bleak_disconnect(self, bleak_dev):
@@ -169,9 +267,11 @@ class BLE_Device():
 			return self.connected
 
 	# set/unset registrations separately
-	async def register_callback(self, callback):
+	# timeout: Seconds the callback gets per call before it's cancelled and the
+	# drain moves on to the next one.  None to let it take as long as it takes
+	async def register_callback(self, callback, timeout=None):
 		callback_uuid = str(uuid.uuid4())
-		self.drainlock_changes_queue.put(('callback', 'register', (callback_uuid,callback)))
+		self.drainlock_changes_queue.put(('callback', 'register', (callback_uuid,callback,timeout)))
 
 		# If outside of the drain, process now!
 		if not self.drain_lock.locked():
@@ -189,7 +289,13 @@ class BLE_Device():
 				await self.__process_drainlock_queue()
 
 	# Hmm... just because this returns true doesn't mean you're going to get the messages (see failure modes in __process_drainlock_queue)
-	async def subscribe_to_messages_on_callback(self, callback_uuid, message_type, subscribe=True):
+	# conflate: If the callback is still busy when more messages of this type
+	# show up, skip to the newest one for each (type, key, port) instead of
+	# getting every one of them.  For continuous readings like ('imu','accel',...)
+	# batch_size: Call the callback with a list of up to this many messages
+	# instead of once per message.  Sent when the list is full, or batch_latency
+	# seconds after the first message went into it, whichever is first
+	async def subscribe_to_messages_on_callback(self, callback_uuid, message_type, subscribe=True, conflate=False, batch_size=0, batch_latency=0.1):
 		# Not going to check if the callback is valid here, because it could be on the queue
 
 		# Contains all message_types for the class after _reset_event_subscription_counters() in subclasses
@@ -198,7 +304,18 @@ class BLE_Device():
 			self.logger.error(f'Class {self.__class__.__name__} can\'t subscribe to {message_type}')
 			return False
 
-		self.drainlock_changes_queue.put(('subscription', 'change', (callback_uuid,message_type,subscribe)))
+		if conflate and message_type in self.discrete_message_types:
+			self.logger.error(f'{message_type} messages are discrete events and can\'t be conflated')
+			return False
+
+		batch = None
+		if batch_size:
+			if batch_size < 1 or batch_latency <= 0:
+				self.logger.error(f'Invalid batch of {batch_size} messages within {batch_latency}s for {message_type}')
+				return False
+			batch = (batch_size, batch_latency)
+
+		self.drainlock_changes_queue.put(('subscription', 'change', (callback_uuid,message_type,subscribe,conflate,batch)))
 
 		# If outside of the drain, process now!
 		if not self.drain_lock.locked():
@@ -232,35 +349,58 @@ class BLE_Device():
 					current_subscriptions = callback_settings[1]
 
 					self.logger.debug(f'Unusbscribe processing {callback_uuid}')
-					for subscription in current_subscriptions:
-						self._set_callback_subscriptions(parameters[0], subscription, False)
-
-						if (self.BLE_event_subscriptions[subscription] <= 0):
-							if not self._set_hardware_subscription(subscription, False):
-								self.logger.error(f'UUID {callback_uuid} requested unsubscribe... but.. the device was not connected?')
+					async with self.port_lock:
+						for subscription in current_subscriptions:
+							self.conflated_subscriptions.discard((callback_uuid, subscription))
+							self.batched_subscriptions.pop((callback_uuid, subscription), None)
+							self._drop_batch((callback_uuid, subscription))
+							self._set_callback_subscriptions(parameters[0], subscription, False)
+
+							if (self.BLE_event_subscriptions[subscription] <= 0):
+								if not self._set_hardware_subscription(subscription, False):
+									self.logger.error(f'UUID {callback_uuid} requested unsubscribe... but.. the device was not connected?')
 					self.logger.debug(f'Finished processing unsubscribes {callback_uuid}')
 
 					self.callbacks.pop(callback_uuid, None)
+					self.callback_timeouts.pop(callback_uuid, None)
+					self.callback_stats.pop(callback_uuid, None)
 
-				# FIXME: Doesn't actually take the third parameter
-				# (callback_uuid,callback,subscription_tuple)
+				# (callback_uuid,callback,timeout)
 				elif change_order[1] == 'register':
 					self.logger.debug(f'Registering callback {parameters[0]}')
 					self.callbacks[parameters[0]] = (parameters[1], ())
+					self.callback_stats[parameters[0]] = { 'calls': 0, 'total': 0.0, 'max': 0.0, 'errors': 0, 'timeouts': 0 }
+					if parameters[2]:
+						self.callback_timeouts[parameters[0]] = parameters[2]
 
 			# Caller verifies message_type
-			# (callback_uuid, message_type, boolean_subscription)
+			# (callback_uuid, message_type, boolean_subscription, boolean_conflate, (batch_size, batch_latency) or None)
 			elif change_order[0] == 'subscription' and change_order[1] == 'change':
 				self.logger.debug(f'Requesting {parameters[2]} subscription to {parameters[1]} on callback {parameters[0]}')
 
+				# Set before the index gets rebuilt below
+				subscription_key = (parameters[0], parameters[1])
+				if parameters[2] and parameters[3]:
+					self.conflated_subscriptions.add(subscription_key)
+				else:
+					self.conflated_subscriptions.discard(subscription_key)
+				if parameters[2] and parameters[4]:
+					self.batched_subscriptions[subscription_key] = parameters[4]
+				else:
+					self.batched_subscriptions.pop(subscription_key, None)
+					# Whatever was waiting still goes out (as a batch) if it's still subscribed
+					if subscription_key in self.callback_batches:
+						await self._send_batch(subscription_key)
+
 				# first subscribing callback: turn on the event	OR last subscribing callback: turn off the subscription
 				# Otherwise, don't bother the hardware
-				if (self.BLE_event_subscriptions[parameters[1]] <= 0 and parameters[2]) or (self.BLE_event_subscriptions[parameters[1]] == 1 and not parameters[2]):
-					self._set_callback_subscriptions(parameters[0], parameters[1], parameters[2])
-					if not self._set_hardware_subscription(parameters[1], parameters[2]):
-						self.logger.error("INVALID Subscription option:"+parameters[1])
-				else:
-					self._set_callback_subscriptions(parameters[0], parameters[1], parameters[2])
+				async with self.port_lock:
+					if (self.BLE_event_subscriptions[parameters[1]] <= 0 and parameters[2]) or (self.BLE_event_subscriptions[parameters[1]] == 1 and not parameters[2]):
+						self._set_callback_subscriptions(parameters[0], parameters[1], parameters[2])
+						if not self._set_hardware_subscription(parameters[1], parameters[2]):
+							self.logger.error("INVALID Subscription option:"+parameters[1])
+					else:
+						self._set_callback_subscriptions(parameters[0], parameters[1], parameters[2])
 
 		if self.TRACE:
 			self.logger.debug(f'DONE WITH DRAINLOCK QUEUE')
@@ -268,17 +408,23 @@ class BLE_Device():
 	async def _drain_messages(self):
 		async with self.drain_lock:
 			while not self.message_queue.empty():
-				message = self.message_queue.get()
-				served = False
-				for callback_uuid, callback_settings in self.callbacks.items():
-					# message_type in subscriptions
-					if message[0] in callback_settings[1]:
+				message, conflation_key = self.message_queue.get_entry()
+				subscribers = self.callback_subscribers.get(message[0])
+				if subscribers:
+					for callback_uuid, callback, conflate, batch in subscribers:
+						# Checked per callback, since newer messages can show up while the previous one runs
+						if conflate and conflation_key and self.message_queue.superseded(conflation_key):
+							conflated_key = (callback_uuid, message[0])
+							self.messages_conflated[conflated_key] = self.messages_conflated.get(conflated_key, 0) + 1
+							continue
+						if batch:
+							await self._batch_message(callback_uuid, message, batch)
+							continue
 						# callback( ( dev_addr, type, key, value ) )
 						if self.TRACE:
 							self.logger.debug(f'DRAINING {message} to {callback_uuid}')
-						await callback_settings[0]((callback_uuid,) + message)
-						served = True
-				if not served:
+						await self._call_callback(callback_uuid, callback, (callback_uuid,) + message)
+				else:
 					self.logger.debug(f'{self.shortname} had no subscribers for message:{message}')
 
 			# Process any registrations that occurred during the above dispatch
@@ -289,6 +435,73 @@ class BLE_Device():
 			if self.TRACE:
 				self.logger.debug(f'PROCESS DRAINLOCK COMPLETE')
 
+	# MUST be called within drain_lock, like the rest of the dispatch
+	async def _batch_message(self, callback_uuid, message, batch):
+		batch_key = (callback_uuid, message[0])
+		messages = self.callback_batches.get(batch_key)
+		if messages is None:
+			messages = []
+			self.callback_batches[batch_key] = messages
+			self._batch_timers[batch_key] = asyncio.get_running_loop().call_later(batch[1], self._batch_latency_expired, batch_key)
+		messages.append((callback_uuid,) + message)
+		if len(messages) >= batch[0]:
+			await self._send_batch(batch_key)
+
+	def _batch_latency_expired(self, batch_key):
+		self._batch_timers.pop(batch_key, None)
+		asyncio.create_task(self._send_late_batch(batch_key))
+
+	async def _send_late_batch(self, batch_key):
+		async with self.drain_lock:
+			await self._send_batch(batch_key)
+			# Same as the end of a drain, the callback could have changed subscriptions
+			await self.__process_drainlock_queue()
+
+	# MUST be called within drain_lock
+	async def _send_batch(self, batch_key):
+		self._drop_batch_timer(batch_key)
+		messages = self.callback_batches.pop(batch_key, None)
+		if messages and batch_key[0] in self.callbacks:
+			# callback( [ ( dev_addr, type, key, value ), ... ] )
+			if self.TRACE:
+				self.logger.debug(f'DRAINING {len(messages)} {batch_key[1]} MESSAGES to {batch_key[0]}')
+			await self._call_callback(batch_key[0], self.callbacks[batch_key[0]][0], messages)
+
+	# One callback blowing up or hanging shouldn't keep the messages from the rest
+	async def _call_callback(self, callback_uuid, callback, message):
+		stats = self.callback_stats.get(callback_uuid)
+		timeout = self.callback_timeouts.get(callback_uuid)
+		start = time.perf_counter()
+		try:
+			if timeout:
+				await asyncio.wait_for(callback(message), timeout)
+			else:
+				await callback(message)
+		except asyncio.TimeoutError:
+			if stats:
+				stats['timeouts'] += 1
+			self.logger.error(f'{self.shortname} callback {callback_uuid} took longer than {timeout}s and was cancelled')
+		except Exception as e:
+			if stats:
+				stats['errors'] += 1
+			self.logger.error(f'{self.shortname} callback {callback_uuid} failed: {e!r}')
+
+		if stats:
+			duration = time.perf_counter() - start
+			stats['calls'] += 1
+			stats['total'] += duration
+			if duration > stats['max']:
+				stats['max'] = duration
+
+	def _drop_batch(self, batch_key):
+		self._drop_batch_timer(batch_key)
+		self.callback_batches.pop(batch_key, None)
+
+	def _drop_batch_timer(self, batch_key):
+		timer = self._batch_timers.pop(batch_key, None)
+		if timer:
+			timer.cancel()
+
 	# return the tuple of subscriptions that were set
 	# Assumes you filtered this to only valid message types
 	def _set_callback_subscriptions(self, callback_uuid, message_type, subscribe=True):
@@ -317,6 +530,8 @@ class BLE_Device():
 		if do_nothing:
 			new_subscriptions = current_subscriptions
 			self.logger.debug(f'Callback subscriptions unchanged after requesting {message_type} to {subscribe}')
+			# Might only be changing whether it's conflated
+			self._index_callback_subscribers(message_type)
 		else:
 			if subscribe:
 				self.BLE_event_subscriptions[message_type] += 1
@@ -326,9 +541,25 @@ class BLE_Device():
 				self.logger.debug(f'Removing callback {callback_uuid} subscription to {message_type}')
 
 			self.callbacks[callback_uuid] = (callback_settings[0], new_subscriptions)
+			self._index_callback_subscribers(message_type)
 
 		return new_subscriptions
 
+	# Rebuild the dispatch list for message_type from self.callbacks
+	# Replaced rather than modified, so a dispatch in progress keeps its list
+	def _index_callback_subscribers(self, message_type):
+		subscribers = [ (callback_uuid, callback_settings[0], (callback_uuid, message_type) in self.conflated_subscriptions, self.batched_subscriptions.get((callback_uuid, message_type))) for callback_uuid, callback_settings in self.callbacks.items() if message_type in callback_settings[1] ]
+		if subscribers:
+			self.callback_subscribers[message_type] = subscribers
+		else:
+			self.callback_subscribers.pop(message_type, None)
+
+		# Only count pending messages for types somebody is conflating
+		if any(subscriber[2] for subscriber in subscribers):
+			self.message_queue.conflated_types.add(message_type)
+		else:
+			self.message_queue.conflated_types.discard(message_type)
+
 	# Checks all Properties and Ports for LPF devices that handle the given message_type
 	# Subscribes or unsubscribes to these messages as requested
 	def _set_hardware_subscription(self, message_type, should_subscribe=True):
@@ -337,22 +568,100 @@ class BLE_Device():
 
 	# Bleak events get sent here
 	async def _device_events(self, sender, data):
+		if self.deferred_decode:
+			if self._notification_task is None or self._notification_task.done():
+				self._notification_task = asyncio.create_task(self._consume_notifications())
+			notification = (sender.uuid, data, time.perf_counter())
+			if self.notification_queue.full():
+				if self.notification_overflow_policy == 'block':
+					await self.notification_queue.put(notification)
+					return
+				self.notifications_dropped += 1
+				if self.notification_overflow_policy == 'drop_newest':
+					return
+				self.notification_queue.get_nowait()
+			self.notification_queue.put_nowait(notification)
+			return
+		await self._process_notification(sender.uuid, data)
+
+	async def _consume_notifications(self):
+		while True:
+			char_uuid, data, received = await self.notification_queue.get()
+			lag = time.perf_counter() - received
+			if lag > self.notification_lag_max:
+				self.notification_lag_max = lag
+			try:
+				await self._process_notification(char_uuid, data)
+			except Exception as e:
+				self.logger.error(f'{self.shortname} failed to process notification {data}: {e!r}')
+
+	async def _process_notification(self, char_uuid, data):
 		# Suddenly _which_ characteristic you subscribe to becomes super important when WeDo2 is involved...
-		bt_message = self.packet_decoder(data, sender.uuid)
-		msg_prefix = self.shortname+" "
+		if self.zero_copy_decode:
+			data = memoryview(data)
+		bt_message = self.packet_decoder(data, char_uuid, self.lazy_readable)
 		if bt_message['error']:
-			self.logger.error(msg_prefix+"ERR:"+bt_message['readable'])
+			self.logger.error(self.shortname+" ERR:"+bt_message['readable'])
 			self.message_queue.put(('error','message',bt_message['readable']))
 
 		else:
 			if not await self._process_bt_message(bt_message):
 				# debug for messages we've never seen before
-				self.logger.info(msg_prefix+"-?- "+bt_message['readable'],1)
+				self.logger.info(self.shortname+" -?- "+bt_message['readable'],1)
+
+		if self.log_debug:
+			self.logger.debug(f'{self.shortname} Draining for: '+bt_message['readable'])
+		# Callbacks get the messages from the delivery task, so a slow one doesn't hold up Bleak...
+		self._start_message_delivery()
+		# ...unless the queue is full of messages that shouldn't be dropped
+		await self.message_queue.wait_for_room()
+
+	def _start_message_delivery(self):
+		if self._delivery_task is None or self._delivery_task.done():
+			self._delivery_task = asyncio.create_task(self._deliver_messages())
+
+	async def _deliver_messages(self):
+		while True:
+			await self.message_queue.wait_for_messages()
+			try:
+				await self._drain_messages()
+			except Exception as e:
+				self.logger.error(f'{self.shortname} message delivery failed: {e!r}')
+			if self.TRACE:
+				self.logger.debug(f'{self.shortname} Drained')
+
+	def set_message_overflow_policy(self, message_type, policy):
+		"""
+		What to do with message_type messages when the message queue already
+		has message_queue.max_depth messages waiting for the callbacks:
+		'block', 'drop_oldest' or 'drop_newest' (see MessageQueue)
+		"""
+		if not message_type in self.BLE_event_subscriptions:
+			self.logger.error(f'Class {self.__class__.__name__} doesn\'t send {message_type}')
+			return False
+		return self.message_queue.set_overflow_policy(message_type, policy)
+
+	def set_notification_overflow_policy(self, policy):
+		"""
+		What to do with a Bleak notification when deferred_decode is on and
+		notification_queue is full: 'block', 'drop_oldest' or 'drop_newest'.
+		Dropped notifications are lost before decoding, whatever they were
+		"""
+		if not policy in MessageQueue.overflow_policies:
+			return False
+		self.notification_overflow_policy = policy
+		return True
 
-		self.logger.debug(f'{self.shortname} Draining for: '+bt_message['readable'])
-		await self._drain_messages()
-		if self.TRACE:
-			self.logger.debug(f'{self.shortname} Drained')
+	def message_queue_stats(self):
+		return self.message_queue.stats()
+
+	# { callback_uuid: {'calls', 'total', 'max', 'errors', 'timeouts'} } with total and max in seconds
+	def callback_timing_stats(self):
+		return { callback_uuid: dict(stats) for callback_uuid, stats in self.callback_stats.items() }
+
+	# { (callback_uuid, message_type): messages skipped because a newer one was waiting }
+	def conflation_stats(self):
+		return dict(self.messages_conflated)
 
 	# Returns false if unprocessed
 	# Override in subclass, call super if you don't process the bluetooth message type
@@ -367,7 +676,13 @@ class BLE_Device():
 
 	# ---- Bluetooth port writes for mortals ----
 
-	def _gatt_send(self, payload, target):
+	def _gatt_send(self, payload, target, coalesce_key=None):
+		"""
+		coalesce_key:
+			Writes with the same key that are still waiting to go out are
+			superseded by this one when coalesce_gatt_writes is on.  Devices use
+			(port, mode, subcommand) for values where only the latest one matters
+		"""
 		from . import await_function_off_bleak_callback
 
 		target_char_uuid = None
@@ -382,7 +697,17 @@ class BLE_Device():
 		if self.connected:
 			if self.TRACE:
 				self.logger.debug("GATT SEND: "+" ".join(hex(n) for n in payload))
-			await_function_off_bleak_callback(self.client.write_gatt_char(target_char_uuid, payload))
+			# Keyed so writes to this characteristic stay in order but don't wait on other devices
+			buckets = self._gatt_send_buckets(target, target_char_uuid)
+			if coalesce_key is not None and self.coalesce_gatt_writes:
+				coalesce_key = (target_char_uuid, coalesce_key)
+				if coalesce_key in self.coalesced_gatt_writes:
+					self.gatt_writes_coalesced += 1
+				# Queued at the back so it still goes out after anything sent before it (like a mode select)
+				self.coalesced_gatt_writes[coalesce_key] = payload
+				await_function_off_bleak_callback(self._coalesced_gatt_write(target_char_uuid, payload, coalesce_key), (self, target_char_uuid), self._coalesced_gatt_write_pacing(buckets, payload, coalesce_key))
+			else:
+				await_function_off_bleak_callback(self._paced_gatt_write(target_char_uuid, payload), (self, target_char_uuid), self._gatt_write_pacing(buckets))
 			if self.TRACE:
 				self.logger.debug("GATT CMPL: "+" ".join(hex(n) for n in payload))
 			return True
@@ -390,4 +715,44 @@ class BLE_Device():
 			self.logger.warn("GATT SEND PROHIBITED: NOT CONNECTED")
 			return False
 
+	def _gatt_send_bucket(self, bucket_name, interval, burst):
+		bucket = self.gatt_send_buckets.get(bucket_name)
+		if bucket is None:
+			bucket = GATTTokenBucket(interval, burst)
+			self.gatt_send_buckets[bucket_name] = bucket
+		else:
+			# Pick up any changes to the limits
+			bucket.interval = interval
+			bucket.burst = burst
+		return bucket
+
+	# Override to pace some targets differently, call super to keep the characteristic's pacing
+	def _gatt_send_buckets(self, target, target_char_uuid):
+		return (self._gatt_send_bucket(target_char_uuid, self.gatt_send_rate_limit, self.gatt_send_burst),)
+
+	# The waiting on the pacing is handed to the lane separately from the write,
+	# so it doesn't count against the other devices' concurrent writes
+	async def _gatt_write_pacing(self, buckets):
+		for bucket in buckets:
+			await bucket.acquire()
+
+	async def _paced_gatt_write(self, target_char_uuid, payload):
+		await self.client.write_gatt_char(target_char_uuid, payload)
+
+	async def _coalesced_gatt_write_pacing(self, buckets, payload, coalesce_key):
+		# Superseded while waiting in the lane, don't even spend a token on it
+		if self.coalesced_gatt_writes.get(coalesce_key) is not payload:
+			return
+		await self._gatt_write_pacing(buckets)
+
+	async def _coalesced_gatt_write(self, target_char_uuid, payload, coalesce_key):
+		# ...or while waiting on the pacing
+		if self.coalesced_gatt_writes.get(coalesce_key) is not payload:
+			return
+		del self.coalesced_gatt_writes[coalesce_key]
+		await self.client.write_gatt_char(target_char_uuid, payload)
+
+	def gatt_send_stats(self):
+		return { bucket_name: bucket.stats() for bucket_name, bucket in self.gatt_send_buckets.items() }
+
 	# ---- Bluetooth port writes for the class ----
@@ -4,7 +4,6 @@ import logging
 from queue import SimpleQueue
 from collections.abc import Iterable
 
-import datetime
 import json
 
 from bleak import BleakClient
@@ -17,6 +16,8 @@ from .LPF_Devices.LPF_Device import generate_valid_lpf_message_types
 from .HubProperty import HubProperty
 from .HubPort import HubPort
 from .HubPortModeInfo import HubPortModeInfo
+from .PortInfoCache import PortInfoCache
+from .Message import device_message_types, NOOP
 
 from .BLE_Device import BLE_Device
 
@@ -51,19 +52,17 @@ class BLE_LWP_Device(BLE_Device):
 	# error
 	#	message:	(str)
 
-	message_types = (
-		'event',
-		'info',
-		'error',
-		'device_ready',
-		'connection_request',
-		'property',
-	)
+	message_types = device_message_types
 
 	device_property_exclusion_str = (
 		'Mario Volume',
 	)
 
+	# Port mode info (interrogate_ports()) by hub class, device type and version
+	# A PortInfoCache, or None to always probe.  Off unless turned on with
+	# BTLego.enable_port_info_cache(), since it writes to the disk
+	port_info_cache = None
+
 	# ok, but what is service ID F000FFC0-0451-4000-B000-000000000000 with the
 	# following characteristic IDs for LEGO Mario?
 	# FOTA?  OAD Service? Texas Instruments OTA firmware download?
@@ -81,7 +80,11 @@ class BLE_LWP_Device(BLE_Device):
 
 		super().__init__(advertisement_data, shortname)
 
+		# Port configuration (mostly interrogate_ports() mode probes) is paced
+		# separately, on top of gatt_send_rate_limit
+		# Each probe gets several replies back, so a few per second keeps the notifications from piling up
 		self.mode_probe_rate_limit = 0.3
+		self.mode_probe_burst = 2
 
 		# LWP
 		self.characteristics = {
@@ -98,16 +101,38 @@ class BLE_LWP_Device(BLE_Device):
 		# port mode information requests ( interrogate_ports() )
 		self.mode_probe_ignored_info_types = ()
 
+		# Where interrogate_ports() looks before probing a port, and saves what
+		# the probes found.  Shared by all the devices unless replaced.  None to
+		# always probe, which is the default
+		self.port_info_cache = BLE_LWP_Device.port_info_cache
+
+		# asyncio.TimerHandle while running, None when not
 		self.watchdogs = {
 			'port_info_request': None,
 			'device_init': None
 		}
+		self.watchdog_timeout = 10		# Seconds
 
 		self.minimum_attached_ports = 0
 
+		# Hold port output commands while the port's buffer is full instead of
+		# writing them anyway, see HubPort.hold_output_command()
+		# Off by default: every output command then asks the hub for command
+		# feedback, and not every hub has been checked for sending it
+		self.output_flow_control = False
+		self.output_max_in_flight = 2		# One running, one in the hub's buffer
+		self.output_feedback_timeout = 1.0	# Seconds without feedback before giving up on it
+		self._output_stall_timers = {}		# port: asyncio.TimerHandle
+
+		self.bt_message_processors = self._generate_bt_message_processors()
+
 		self.ports = {}
 		self.properties = {}
 
+		# port: bound decode_pvs of the attached device, so a port value is one
+		# lookup away from being decoded.  Rebuilt when devices come and go
+		self.pvs_routes = {}
+
 		self._init_hub_properties()
 
 	def _init_hub_properties(self):
@@ -118,7 +143,62 @@ class BLE_LWP_Device(BLE_Device):
 	# override: Keep track of how long it takes to track all the device inits
 	async def connect(self, device):
 		await super().connect(device)
-		self.watchdogs['device_init'] = datetime.datetime.now()
+		# connect() logs and returns if it fails, and there won't be any inits to wait on
+		if self.connected:
+			self._start_watchdog('device_init', self._device_init_timeout)
+
+	async def disconnect(self):
+		self._stop_watchdogs()
+		self._stop_output_stall_timers()
+		await super().disconnect()
+
+	# override: Nothing is coming back to finish what the watchdogs are waiting on
+	def _bleak_disconnect(self, bleak_dev):
+		self._stop_watchdogs()
+		self._stop_output_stall_timers()
+		super()._bleak_disconnect(bleak_dev)
+
+	def _stop_watchdogs(self):
+		for watchdog in self.watchdogs:
+			self._stop_watchdog(watchdog)
+
+	# Held output commands have nowhere to go once the link is gone
+	def _stop_output_stall_timers(self):
+		for port in list(self._output_stall_timers):
+			self._stop_output_stall_timer(port)
+		for port in self.ports:
+			self.ports[port].reset_output_flow()
+
+	def _stop_output_stall_timer(self, port):
+		timer = self._output_stall_timers.pop(port, None)
+		if timer:
+			timer.cancel()
+
+	# (Re)starts the timer, so it's watchdog_timeout from the last call
+	def _start_watchdog(self, watchdog, timeout_function):
+		self._stop_watchdog(watchdog)
+		self.watchdogs[watchdog] = asyncio.get_running_loop().call_later(self.watchdog_timeout, timeout_function)
+
+	def _stop_watchdog(self, watchdog):
+		if self.watchdogs[watchdog]:
+			self.watchdogs[watchdog].cancel()
+			self.watchdogs[watchdog] = None
+
+	def _port_info_request_timeout(self):
+		self.logger.error(f'{self.shortname} mode info request watchdog timeout!')
+		self.watchdogs['port_info_request'] = None
+		self.message_queue.put(('error','message',f"Mode info requests were still outstanding when watchdog timed out"))
+		# No notification coming in to kick off the delivery
+		self._start_message_delivery()
+		if self.log_debug:
+			self.dump_status()
+
+	def _device_init_timeout(self):
+		self.logger.error(f'{self.shortname} mode info request device_watchdog timeout.  Assuming device enumeration complete and signaling such')
+		self.watchdogs['device_init'] = None
+		self.message_queue.put(('info','initialized',('minimum_connected_ports', len(self.ports))))
+		self._inital_connect_updates()
+		self._start_message_delivery()
 
 	def _init_port_data(self, bt_message):
 
@@ -129,12 +209,9 @@ class BLE_LWP_Device(BLE_Device):
 			self.ports[port].mode_probe_ignored_info_types = self.mode_probe_ignored_info_types
 
 		port_id = bt_message['io_type_id']
-		port_classname = LPF_class_for_type_id(port_id)
+		port_classobj = LPF_classobj_for_type_id(port_id)
 		retval = False
-		if port_classname:
-			# https://stackoverflow.com/a/547867
-			port_module = __import__('BTLego.LPF_Devices.'+port_classname, fromlist=[port_classname])
-			port_classobj = getattr(port_module, port_classname)
+		if port_classobj:
 			attaching_device = port_classobj()
 
 			if port_id in Decoder.io_type_id_str:
@@ -143,7 +220,7 @@ class BLE_LWP_Device(BLE_Device):
 				self.logger.error(f'Previously unknown port identifier {port_id} on device {self.__class__.__name__}')
 				attaching_device.name = f"UNKNOWN_DEV_ON_PORT_{port_id}"
 
-			if port_classname == 'LPF_Device':
+			if port_classobj is LPF_Device:
 				self.logger.warning(f'Class {self.__class__.__name__} contains device type id {port_id} ({attaching_device.name}) on port {port} that has no class handler')
 				attaching_device.port_id = port_id
 			else:
@@ -162,6 +239,7 @@ class BLE_LWP_Device(BLE_Device):
 					# On init, don't have to unsub
 
 			self.ports[port].attach_device(attaching_device)
+			self._rebuild_pvs_routes()
 
 			# FIXME: Ah, this is fun:  On hub4, Voltage, RGB and Current are laggards so this returns too early
 			self.message_queue.put(('device_ready', port_id, port))
@@ -170,15 +248,30 @@ class BLE_LWP_Device(BLE_Device):
 			self.logger.warning(f'Class {self.__class__.__name__} contains unknown device type id {port_id} on port {port}')
 
 		if len(self.ports) == self.minimum_attached_ports:
-			self.watchdogs['device_init'] = None
+			self._stop_watchdog('device_init')
 			self.message_queue.put(('info','initialized',('minimum_connected_ports', len(self.ports))))
 			self._inital_connect_updates()
 		return retval
 
 	def _detach_lpf_device(self,port):
 		if port in self.ports:
+			self._stop_output_stall_timer(port)
 			self.ports[port].detach_device()
 			del self.ports[port]
+			self._rebuild_pvs_routes()
+
+	# Does the consistency checking up front instead of on every port value
+	def _rebuild_pvs_routes(self):
+		pvs_routes = {}
+		for port, hub_port in self.ports.items():
+			device = hub_port.attached_device
+			if device:
+				if port != device.port:
+					self.logger.error(f"CONSISTENCY ERROR: DEVICE ON PORT {port} NOT EQUAL TO PORT {device.port} IN CLASS")
+					# FIXME: Harsh?
+					quit()
+				pvs_routes[port] = device.decode_pvs
+		self.pvs_routes = pvs_routes
 
 	def _reset_port_mode_info(self):
 		for port in list(self.ports):
@@ -220,6 +313,8 @@ class BLE_LWP_Device(BLE_Device):
 		for prop_int, propobj in self.properties.items():
 			self.logger.info(f'\tProperty {propobj.name} ({propobj.reference_number}) Subscribed: {propobj.subscribed}')
 		self.logger.info(f"PORT MODE INFO\n{json.dumps(self._generate_port_info_dict(), indent=4)}")
+		if self.port_info_cache:
+			self.logger.info(f'PORT INFO CACHE: {self.port_info_cache.stats()}')
 
 	# ---- Message processing ----
 
@@ -247,181 +342,244 @@ class BLE_LWP_Device(BLE_Device):
 	# Returns false if unprocessed
 	# Override in subclass, call super if you don't process the bluetooth message type
 	async def _process_bt_message(self, bt_message):
-		msg_prefix = self.shortname+" "
 
-		if self.watchdogs['port_info_request']:
-			if (self.watchdogs['port_info_request'] +  + datetime.timedelta(seconds=10)) < datetime.datetime.now():
-				self.logger.error(f'{self.shortname} mode info request watchdog timeout!')
-				self.watchdogs['port_info_request'] = None
-				self.message_queue.put(('error','message',f"Mode info requests were still outstanding when watchdog timed out"))
-				if self.logger.isEnabledFor(logging.DEBUG):
-					self.dump_status()
-
-		if self.watchdogs['device_init']:
-			if (self.watchdogs['device_init']  + datetime.timedelta(seconds=10)) < datetime.datetime.now():
-				self.logger.error(f'{self.shortname} mode info request device_watchdog timeout.  Assuming device enumeration complete and signaling such')
-				self.watchdogs['device_init'] = None
-				self.message_queue.put(('info','initialized',('minimum_connected_ports', len(self.ports))))
-				self._inital_connect_updates()
-
-		if Decoder.message_type_str[bt_message['type']] == 'port_input_format_single':
-			if self.logger.isEnabledFor(logging.DEBUG):
-				msg = "Disabled notifications on "
-				if bt_message['notifications']:
-					# Returned typically after gatt write
-					msg = "Enabled notifications on "
-
-				port_text = "port "+str(bt_message['port'])
-
-				if bt_message['port'] in self.ports:
-					port = bt_message['port']
-					device = self.ports[port].attached_device
-					port_text = f"{device.name} port ({port})"
+		# Port values are most of the traffic, so skip straight to the device
+		if bt_message['type'] == 0x45:		# Decoder.message_type_str 'port_value_single'
+			await self._process_port_value_single(bt_message)
+			return True
 
-				self.logger.debug(msg_prefix+msg+port_text+", mode "+str(bt_message['mode']))
+		bt_message_processor = self.bt_message_processors.get(bt_message['type'])
+		if not bt_message_processor:
+			return False
+
+		await bt_message_processor(bt_message)
+		return True
 
-		# Sent on connect, without request
-		elif Decoder.message_type_str[bt_message['type']] == 'hub_attached_io':
-			event = Decoder.io_event_type_str[bt_message['event']]
+	# Decoder.message_type_str index -> bound _process_<message type> for this device
+	# Subclasses override the _process_<message type> function instead of _process_bt_message
+	def _generate_bt_message_processors(self):
+		bt_message_processors = {}
+		for message_type_int, message_type in Decoder.message_type_str.items():
+			bt_message_processor = getattr(self, '_process_'+message_type, None)
+			if bt_message_processor:
+				bt_message_processors[message_type_int] = bt_message_processor
+		return bt_message_processors
+
+	async def _process_port_input_format_single(self, bt_message):
+		if self.log_debug:
+			msg_prefix = self.shortname+" "
+			msg = "Disabled notifications on "
+			if bt_message['notifications']:
+				# Returned typically after gatt write
+				msg = "Enabled notifications on "
+
+			port_text = "port "+str(bt_message['port'])
 
-			port = -1
 			if bt_message['port'] in self.ports:
 				port = bt_message['port']
+				device = self.ports[port].attached_device
+				port_text = f"{device.name} port ({port})"
 
-			if event == 'attached':
-				dev = "UNKNOWN DEVICE"
-				if bt_message['io_type_id'] in Decoder.io_type_id_str:
-					dev = Decoder.io_type_id_str[bt_message['io_type_id']]
-				else:
-					dev += "_"+str(bt_message['io_type_id'])
-
-				if port != -1:
-					self.logger.info(msg_prefix+"Re-attached "+dev+" on port "+str(bt_message['port']))
-					device = self.ports[port].attached_device
-					device.status = bt_message['event']
-				else:
-					self.logger.info(msg_prefix+"Attached "+dev+" on port "+str(bt_message['port']))
-					# Can't mess with the port list outside of the drain lock
-					async with self.drain_lock:
-						if not self._init_port_data(bt_message):
-							if bt_message['io_type_id'] in Decoder.io_type_id_str:
-								self.logger.warning(msg_prefix+" NO CLASS EXISTS FOR LPF ATTACHED DEVICE "+Decoder.io_type_id_str[bt_message['io_type_id']]+": "+str(bt_message['readable']))
-							else:
-								self.logger.warning(msg_prefix+" TOTALLY UNKNOWN DEVICE "+str(bt_message['io_type_id'])+": "+str(bt_message['readable']))
-
-			elif event == 'detached':
-				self.logger.info(msg_prefix+"Detached device on port "+str(bt_message['port']))
-				self._detach_lpf_device(bt_message['port'])
-
-			else:
-				self.logger.info(msg_prefix+"HubAttachedIO: "+bt_message['readable'])
-
-		elif Decoder.message_type_str[bt_message['type']] == 'port_value_single':
+			self.logger.debug(msg_prefix+msg+port_text+", mode "+str(bt_message['mode']))
 
-			device = None
+	async def _process_port_input_format_combi(self, bt_message):
+		if self.log_debug:
+			port_text = "port "+str(bt_message['port'])
 			if bt_message['port'] in self.ports:
 				port = bt_message['port']
 				device = self.ports[port].attached_device
 				if device:
-					if port != device.port:
-						self.logger.error(f"CONSISTENCY ERROR: DEVICE ON PORT {port} NOT EQUAL TO PORT {device.port} IN CLASS")
-						# FIXME: Harsh?
-						quit()
+					port_text = f"{device.name} port ({port})"
+			self.logger.debug(self.shortname+" Combined input format on "+port_text+": "+bt_message['readable'])
 
-					message = device.decode_pvs(port, bt_message['value'])
-					if message is None:
-						if self.TRACE:
-							self.logger.debug(f'{msg_prefix} {device.name} ({device.__class__.__name__}) declared NO-OP for PVS:'+bt_message['readable'])
-					else:
-						if len(message) == 3:
-							if message[0] != 'noop':
-								self.message_queue.put(message)
-						elif len(message) == 2 or len(message) > 3:
-							self.logger.error(f'{msg_prefix}{message[0]} on {device.name} port {port} missing key & value while processing PVS:{message[1]}')
-						else:
-							self.logger.error(f'{msg_prefix} {device.name} FAILED TO DECODE PVS DATA ON PORT {port}:'+" ".join(hex(n) for n in bt_message['value']))
-				else:
-					self.logger.error(f'{msg_prefix} Received data for unconfigured port {port}:'+bt_message['readable'])
-			else:
-				# FIXME: Getting this is a port re-init problem on reconnect
-				self.logger.error(f'{msg_prefix} Got PVS from port not in port list ({self.ports}): {bt_message}')
+	# Sent on connect, without request
+	async def _process_hub_attached_io(self, bt_message):
+		msg_prefix = self.shortname+" "
+		event = Decoder.io_event_type_str[bt_message['event']]
 
-		elif Decoder.message_type_str[bt_message['type']] == 'hub_properties':
-			if not Decoder.hub_property_op_str[bt_message['operation']] == 'Update':
-				# everything else is a write, so you shouldn't be getting these messages!
-				self.logger.error(msg_prefix+"THIS CLIENT DOES NOT UPDATE YET THIS MESSAGE EXISTS: "+bt_message['readable'])
+		port = -1
+		if bt_message['port'] in self.ports:
+			port = bt_message['port']
 
+		if event == 'attached':
+			dev = "UNKNOWN DEVICE"
+			if bt_message['io_type_id'] in Decoder.io_type_id_str:
+				dev = Decoder.io_type_id_str[bt_message['io_type_id']]
 			else:
-				if not bt_message['property'] in Decoder.hub_property_str:
-					self.logger.warning(msg_prefix+"Unknown property "+bt_message['readable'])
-				else:
-					prop_id = bt_message['property']
-					self._decode_property(prop_id, bt_message['value'])
-					self.message_queue.put( ('property', prop_id, bt_message['value']) )
+				dev += "_"+str(bt_message['io_type_id'])
 
-		elif Decoder.message_type_str[bt_message['type']] == 'port_output_command_feedback':
-			# Don't really care about these messages?  Just a bunch of queue status reporting
-			if self.TRACE:
-				self.logger.debug(msg_prefix+" "+bt_message['readable'])
+			if port != -1:
+				self.logger.info(msg_prefix+"Re-attached "+dev+" on port "+str(bt_message['port']))
+				device = self.ports[port].attached_device
+				device.status = bt_message['event']
+			else:
+				self.logger.info(msg_prefix+"Attached "+dev+" on port "+str(bt_message['port']))
+				# Not while the hardware subscriptions are being changed for the port list
+				async with self.port_lock:
+					if not self._init_port_data(bt_message):
+						if bt_message['io_type_id'] in Decoder.io_type_id_str:
+							self.logger.warning(msg_prefix+" NO CLASS EXISTS FOR LPF ATTACHED DEVICE "+Decoder.io_type_id_str[bt_message['io_type_id']]+": "+str(bt_message['readable']))
+						else:
+							self.logger.warning(msg_prefix+" TOTALLY UNKNOWN DEVICE "+str(bt_message['io_type_id'])+": "+str(bt_message['readable']))
 
-		elif Decoder.message_type_str[bt_message['type']] == 'hub_alerts':
-			# Ignore "status OK" messages
-			if bt_message['status'] == True:
-				self.logger.info(msg_prefix+"ALERT! "+bt_message['alert_type_str']+" - "+bt_message['operation_str'])
-				self.message_queue.put(('error','message',bt_message['alert_type_str']+" - "+bt_message['operation_str']))
+		elif event == 'detached':
+			self.logger.info(msg_prefix+"Detached device on port "+str(bt_message['port']))
+			self._detach_lpf_device(bt_message['port'])
 
-		elif Decoder.message_type_str[bt_message['type']] == 'hub_actions':
-			self._decode_hub_action(bt_message)
+		else:
+			self.logger.info(msg_prefix+"HubAttachedIO: "+bt_message['readable'])
 
-		elif Decoder.message_type_str[bt_message['type']] == 'port_info':
+	async def _process_port_value_single(self, bt_message):
 
-			port = bt_message['port']
-			if port in self.ports:
-				self.ports[port].process_port_info_message(bt_message, self._gatt_send)
+		port = bt_message['port']
+		decode_pvs = self.pvs_routes.get(port)
+		if decode_pvs:
+			message = decode_pvs(port, bt_message['value'])
+			if message is not None and len(message) == 3:
+				if message is not NOOP:
+					self.message_queue.put(message, port)
 			else:
-				self.logger.error(f"{msg_prefix} RECIEVED PORT INFO MESSAGE FOR PORT THAT DOESN'T EXIST: {bt_message['readable']}")
+				self._log_unusable_pvs(port, message, bt_message)
+		elif port in self.ports:
+			self.logger.error(f'{self.shortname}  Received data for unconfigured port {port}:'+bt_message['readable'])
+		else:
+			# FIXME: Getting this is a port re-init problem on reconnect
+			self.logger.error(f'{self.shortname}  Got PVS from port not in port list ({self.ports}): {bt_message}')
 
-		elif Decoder.message_type_str[bt_message['type']] == 'port_mode_info':
-			# Debug stuff for the ports and modes, similar to list command on BuildHAT
-			self.watchdogs['port_info_request'] = datetime.datetime.now()
+	def _log_unusable_pvs(self, port, message, bt_message):
+		device = self.ports[port].attached_device
+		if message is None:
+			if self.TRACE:
+				self.logger.debug(f'{self.shortname}  {device.name} ({device.__class__.__name__}) declared NO-OP for PVS:'+bt_message['readable'])
+		elif len(message) == 2 or len(message) > 3:
+			self.logger.error(f'{self.shortname} {message[0]} on {device.name} port {port} missing key & value while processing PVS:{message[1]}')
+		else:
+			self.logger.error(f'{self.shortname}  {device.name} FAILED TO DECODE PVS DATA ON PORT {port}:'+" ".join(hex(n) for n in bt_message['value']))
 
+	async def _process_port_value_combi(self, bt_message):
+
+		if bt_message['port'] in self.ports:
 			port = bt_message['port']
-			mode = bt_message['mode']
+			device = self.ports[port].attached_device
+			if device:
+				for message in device.decode_pvc(port, bt_message['pointer'], bt_message['value']):
+					if message is None:
+						if self.TRACE:
+							self.logger.debug(f'{self.shortname}  {device.name} ({device.__class__.__name__}) declared NO-OP for PVC:'+bt_message['readable'])
+					elif len(message) == 3:
+						if message is not NOOP:
+							self.message_queue.put(message, port)
+					else:
+						self.logger.error(f'{self.shortname}  {device.name} FAILED TO DECODE PVC DATA ON PORT {port}:'+bt_message['readable'])
+			else:
+				self.logger.error(f'{self.shortname}  Received combined data for unconfigured port {port}:'+bt_message['readable'])
+		else:
+			self.logger.error(f'{self.shortname}  Got PVC from port not in port list ({self.ports}): {bt_message}')
 
-			if port in self.ports:
-				if mode in self.ports[port].reported.modes:
-					self.ports[port].reported.modes[mode].process_mode_info_request(bt_message)
-				else:
-					self.logger.error(f"ERROR: No mode ({mode}) on port ({port}) exists for port info message: {bt_message['readable']}")
+	async def _process_hub_properties(self, bt_message):
+		if not Decoder.hub_property_op_str[bt_message['operation']] == 'Update':
+			# everything else is a write, so you shouldn't be getting these messages!
+			self.logger.error(self.shortname+" THIS CLIENT DOES NOT UPDATE YET THIS MESSAGE EXISTS: "+bt_message['readable'])
+
+		else:
+			if not bt_message['property'] in Decoder.hub_property_str:
+				self.logger.warning(self.shortname+" Unknown property "+bt_message['readable'])
 			else:
-				self.logger.error(f"ERROR: No port ({port}) exists for port info message: {bt_message['readable']}")
+				prop_id = bt_message['property']
+				self._decode_property(prop_id, bt_message['value'])
+				self.message_queue.put( ('property', prop_id, bt_message['value']) )
 
-			incomplete_ports = len(self.ports)
-			for port in self.ports:
-				if self.ports[port].check_probe_completion():
-					incomplete_ports -= 1
-#					print(f"DONE WITH PORT {port} ({incomplete_ports} left)")
+	async def _process_port_output_command_feedback(self, bt_message):
+		if self.TRACE:
+			self.logger.debug(self.shortname+"  "+bt_message['readable'])
+
+		# Port buffer status, which lets held output commands go
+		for port_feedback in bt_message['ports']:
+			port = port_feedback['id']
+			if port in self.ports:
+				for payload, target, coalesce_key in self.ports[port].process_output_feedback(port_feedback['feedback'], self.output_max_in_flight):
+					super()._gatt_send(payload, target, coalesce_key)
 
-			if incomplete_ports == 0:
-				self.watchdogs['port_info_request'] = None
+	async def _process_hub_alerts(self, bt_message):
+		# Ignore "status OK" messages
+		if bt_message['status'] == True:
+			self.logger.info(self.shortname+" ALERT! "+bt_message['alert_type_str']+" - "+bt_message['operation_str'])
+			self.message_queue.put(('error','message',bt_message['alert_type_str']+" - "+bt_message['operation_str']))
 
-				self.message_queue.put(('info','port_json',json.dumps(self._generate_port_info_dict())))
-				self.logger.info("Port interrogation complete!")
+	async def _process_hub_actions(self, bt_message):
+		self._decode_hub_action(bt_message)
 
-		elif Decoder.message_type_str[bt_message['type']] == 'hw_network_cmd':
-			self._decode_hardware_network_command(bt_message)
+	async def _process_port_info(self, bt_message):
 
+		port = bt_message['port']
+		if port in self.ports:
+			self.ports[port].process_port_info_message(bt_message, self._gatt_send)
+			if not 'num_modes' in bt_message:
+				# Mode combinations can show up after the mode info is all in
+				self._save_port_info_cache()
 		else:
-			return False
+			self.logger.error(f"{self.shortname}  RECIEVED PORT INFO MESSAGE FOR PORT THAT DOESN'T EXIST: {bt_message['readable']}")
 
-		return True
+	async def _process_port_mode_info(self, bt_message):
+		# Debug stuff for the ports and modes, similar to list command on BuildHAT
+		# Still hearing back, so give it another watchdog_timeout
+		self._start_watchdog('port_info_request', self._port_info_request_timeout)
+
+		port = bt_message['port']
+		mode = bt_message['mode']
+
+		if port in self.ports:
+			if not self.ports[port].process_mode_info_message(bt_message):
+				self.logger.error(f"ERROR: No mode ({mode}) on port ({port}) exists for port info message: {bt_message['readable']}")
+		else:
+			self.logger.error(f"ERROR: No port ({port}) exists for port info message: {bt_message['readable']}")
+
+		incomplete_ports = len(self.ports)
+		for port in self.ports:
+			if self.ports[port].check_probe_completion():
+				incomplete_ports -= 1
+#				print(f"DONE WITH PORT {port} ({incomplete_ports} left)")
+
+		if incomplete_ports == 0:
+			self._save_port_info_cache()
+			self._port_interrogation_complete()
+
+	def _port_interrogation_complete(self):
+		self._stop_watchdog('port_info_request')
+
+		self.message_queue.put(('info','port_json',json.dumps(self._generate_port_info_dict())))
+		self.logger.info("Port interrogation complete!")
+
+	def _port_info_cache_key(self, port):
+		device = self.ports[port].attached_device
+		if not device:
+			return None
+		return PortInfoCache.key(self.__class__.__name__, device.port_id, device.hw_ver_str, device.fw_ver_str)
+
+	# Puts any finished port probes in the cache
+	def _save_port_info_cache(self):
+		if not self.port_info_cache:
+			return
+		changed = False
+		for port in self.ports:
+			cache_key = self._port_info_cache_key(port)
+			info = self.ports[port].cache_info()
+			if cache_key and info:
+				if self.port_info_cache.put(cache_key, info):
+					changed = True
+		if changed:
+			self.port_info_cache.save()
+
+	async def _process_hw_network_cmd(self, bt_message):
+		self._decode_hardware_network_command(bt_message)
 
 	# Override if you wanna decode a property to send _additional_ messages
 	def _decode_property(self, prop_id, value):
 		pass
 
 	def _decode_hub_action(self, bt_message):
-		self.logger.debug(self.shortname+" "+bt_message['action_str'])
+		if self.log_debug:
+			self.logger.debug(self.shortname+" "+bt_message['action_str'])
 		# Decoder.hub_action_type
 		if bt_message['action'] == 0x30:
 			self.message_queue.put(('event','power','turned_off'))
@@ -449,6 +607,45 @@ class BLE_LWP_Device(BLE_Device):
 		else:
 			self.logger.error(self.shortname+" Apparently not a hw network command?:"+bt_message['readable'])
 
+	# override: Port output commands wait on the port's command feedback
+	def _gatt_send(self, payload, target, coalesce_key=None):
+		if self.output_flow_control and self.connected and len(payload) > 4 and payload[2] == 0x81 and payload[3] in self.ports:
+			# Completion information: Command feedback, which is what frees the port back up
+			# On a copy, the caller might still be using theirs
+			payload = bytearray(payload)
+			payload[4] |= 0x1
+			if self.ports[payload[3]].hold_output_command(payload, target, coalesce_key, self.output_max_in_flight, self.output_feedback_timeout):
+				self._watch_output_stall(payload[3])
+				return True
+		return super()._gatt_send(payload, target, coalesce_key)
+
+	# Make sure held output commands on the port go out eventually, even if the feedback never does
+	def _watch_output_stall(self, port):
+		if port in self._output_stall_timers:
+			return
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			# Nothing to run a timer on, the next output command will check instead
+			return
+		self._output_stall_timers[port] = loop.call_later(self.output_feedback_timeout, self._output_stall_check, port)
+
+	def _output_stall_check(self, port):
+		del self._output_stall_timers[port]
+		if not port in self.ports or not self.connected:
+			return
+		for payload, target, coalesce_key in self.ports[port].release_stalled_output(self.output_max_in_flight, self.output_feedback_timeout):
+			super()._gatt_send(payload, target, coalesce_key)
+		if self.ports[port].output_held:
+			self._watch_output_stall(port)
+
+	# override: Port configuration goes through its own (slower) bucket too
+	def _gatt_send_buckets(self, target, target_char_uuid):
+		buckets = super()._gatt_send_buckets(target, target_char_uuid)
+		if target == 'port_config':
+			buckets = (self._gatt_send_bucket('port_config', self.mode_probe_rate_limit, self.mode_probe_burst),) + buckets
+		return buckets
+
 	# ---- Bluetooth port writes for mortals ----
 	def interrogate_ports(self):
 
@@ -466,11 +663,36 @@ class BLE_LWP_Device(BLE_Device):
 			self.logger.info("Starting port interrogation...")
 			self._reset_port_mode_info()
 
-			self.watchdogs['port_info_request'] = datetime.datetime.now()
+			self._start_watchdog('port_info_request', self._port_info_request_timeout)
 
+			probing = False
 			for port in self.ports:
-				self.logger.warning(f"{self.shortname} Requesting info for port {port} ...")
-				self.ports[port].request_port_info(self._gatt_send)
+				cached_info = None
+				if self.port_info_cache:
+					cache_key = self._port_info_cache_key(port)
+					if cache_key:
+						cached_info = self.port_info_cache.get(cache_key)
+
+				if cached_info:
+					self.logger.info(f"{self.shortname} Using cached info for port {port}")
+					try:
+						self.ports[port].load_cache_info(cached_info, self._gatt_send)
+					except (KeyError, TypeError, ValueError) as e:
+						# Somebody edited the file, or it's from an older version of this
+						self.logger.warning(f"{self.shortname} Unusable cached info for port {port}: {e!r}")
+						# load_cache_info() already undid itself, but don't probe on top of leftovers
+						self.ports[port].reset_mode_info()
+						cached_info = None
+
+				if not cached_info:
+					self.logger.warning(f"{self.shortname} Requesting info for port {port} ...")
+					self.ports[port].request_port_info(self._gatt_send)
+					probing = True
+
+			if not probing:
+				# No replies coming to finish it off
+				self._port_interrogation_complete()
+				self._start_message_delivery()
 
 		else:
 			self.logger.error(f"Refusing to start a second port interrogation until the first one is complete. Currently waiting for {outstanding_probe_requests} requests to complete")
@@ -499,10 +721,12 @@ class BLE_LWP_Device(BLE_Device):
 		for dev in target_devs:
 			if port is not None:
 				if dev.port == port:
-					self.logger.debug(f'SENDING {message} TO SPECIFIC PORT {port} ON DEVICE {dev.name}')
+					if self.log_debug:
+						self.logger.debug(f'SENDING {message} TO SPECIFIC PORT {port} ON DEVICE {dev.name}')
 					dev.send_message(message, self._gatt_send)
 			else:
-				self.logger.debug(f'SENDING {message} TO DEVICE {dev.name}')
+				if self.log_debug:
+					self.logger.debug(f'SENDING {message} TO DEVICE {dev.name}')
 				dev.send_message(message, self._gatt_send)
 
 	def send_property_message(self, property_type_int, message):
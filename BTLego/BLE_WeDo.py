@@ -231,15 +231,12 @@ class BLE_WeDo(BLE_Device):
 			self.ports[port].mode_probe_ignored_info_types = self.mode_probe_ignored_info_types
 
 		port_id = bt_message['io_type_id']
-		port_classname = LPF_class_for_type_id(port_id)
+		port_classobj = LPF_classobj_for_type_id(port_id)
 		retval = False
-		if port_classname:
-			# https://stackoverflow.com/a/547867
-			port_module = __import__('BTLego.LPF_Devices.'+port_classname, fromlist=[port_classname])
-			port_classobj = getattr(port_module, port_classname)
+		if port_classobj:
 			attaching_device = port_classobj()
 
-			if port_classname == 'LPF_Device':
+			if port_classobj is LPF_Device:
 				self.logger.warning(f'Class {self.__class__.__name__} contains device type id {port_id} ({attaching_device.name}) on port {port} that has no class handler')
 
 			attaching_device.port = port
@@ -309,8 +306,8 @@ class BLE_WeDo(BLE_Device):
 						device.status = bt_message['event']
 					else:
 						self.logger.info(msg_prefix+"Attached "+dev+" on port "+str(bt_message['port']))
-						# Can't mess with the port list outside of the drain lock
-						async with self.drain_lock:
+						# Not while the hardware subscriptions are being changed for the port list
+						async with self.port_lock:
 							if not self._init_port_data(bt_message):
 								if bt_message['io_type_id'] in Decoder.io_type_id_str:
 									self.logger.warning(msg_prefix+" NO CLASS EXISTS FOR LPF ATTACHED DEVICE "+Decoder.io_type_id_str[bt_message['io_type_id']]+": "+str(bt_message['readable']))
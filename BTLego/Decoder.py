@@ -72,6 +72,24 @@ class LDev(IntEnum):
 	SIX_LED = 0x58
 
 
+# Decoded message that builds bt_message['readable'] the first time it's looked up
+# Most messages are never logged, so don't pay for the string formatting on every notification
+class BTMessage(dict):
+	__slots__ = ('readable_parts',)
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		# Strings, or functions taking this message and returning a string
+		self.readable_parts = []
+
+	def __missing__(self, key):
+		if key != 'readable':
+			raise KeyError(key)
+		readable = ''.join(part if isinstance(part, str) else part(self) for part in self.readable_parts)
+		self.readable_parts = []
+		self['readable'] = readable
+		return readable
+
 # FIXME: Completely confused on upstream/downstream, fix the nomenclature in the comments
 
 class Decoder():
@@ -95,6 +113,9 @@ class Decoder():
 		0x84:'technicmove'
 	}
 
+	# classname: class object, filled in by class_obj_from_classname()
+	device_classobjs = {}
+
 	ble_dev_classes = {
 		0x20:'DuploTrain',
 		0x40:'Jajur1',
@@ -411,10 +432,14 @@ class Decoder():
 				classname = 'BLE_WeDo'
 		return classname
 
+	# Hub classes are only imported once something asks for one
 	def class_obj_from_classname(classname):
 		if classname:
-			class_module = importlib.import_module(f'BTLego.{classname}')
-			classobj = getattr(class_module, classname)
+			classobj = Decoder.device_classobjs.get(classname)
+			if classobj is None:
+				class_module = importlib.import_module(f'BTLego.{classname}')
+				classobj = getattr(class_module, classname)
+				Decoder.device_classobjs[classname] = classobj
 			return classobj
 		return None
 
@@ -476,83 +501,94 @@ class Decoder():
 
 		return retval
 
-	def decode_payload(message_bytes, source_char_uuid):
-		bt_message = {
+	# Decoded messages start out with either an eager 'readable' string or a
+	# BTMessage that only renders it when something reads it
+	def new_bt_message(message_bytes, source_char_uuid, lazy_readable=False):
+		if lazy_readable:
+			return BTMessage(char_uuid=source_char_uuid, error=False, raw=message_bytes)
+		return {
 			'char_uuid': source_char_uuid,
 			'error': False,
-			'raw':message_bytes
+			'raw':message_bytes,
+			'readable': ''
 		}
+
+	# part is a string or a function taking the bt_message and returning one
+	def add_readable(bt_message, part):
+		if 'readable' in bt_message:
+			if isinstance(part, str):
+				bt_message['readable'] += part
+			else:
+				bt_message['readable'] += part(bt_message)
+		else:
+			bt_message.readable_parts.append(part)
+
+	def set_readable(bt_message, part):
+		if isinstance(bt_message, BTMessage):
+			bt_message.pop('readable', None)
+			bt_message.readable_parts = [part]
+		elif isinstance(part, str):
+			bt_message['readable'] = part
+		else:
+			bt_message['readable'] = part(bt_message)
+
+	def decode_payload(message_bytes, source_char_uuid, lazy_readable=False):
+		bt_message = Decoder.new_bt_message(message_bytes, source_char_uuid, lazy_readable)
 		# FIXME: Doesn't detect lengths over 127
 		# https://lego.github.io/lego-ble-wireless-protocol-docs/index.html#message-length-encoding
 		length = message_bytes[0]
 		unused_hub_id = message_bytes[1]
 		if len(message_bytes) != length:
 			bt_message['error'] = True
-			bt_message['readable'] = "CORRUPTED MESSAGE: stated len "+str(length)+" != "+str(len(message_bytes))+" "+" ".join(hex(n) for n in message_bytes)+" "
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: stated len "+str(length)+" != "+str(len(message_bytes))+" "+" ".join(hex(n) for n in message_bytes)+" ")
 			# Don't return, attempt to decode, since error flag set
-		else:
-			bt_message['readable'] = ''
 		bt_message['type']  = message_bytes[2]
-		bt_message['readable'] += Decoder.int8_dict_to_str(Decoder.message_type_str, bt_message['type']) + " - "
-
-		if bt_message['type'] == 0x1:
-			Decoder.decode_hub_properties(bt_message)
-		elif bt_message['type'] == 0x2:
-			Decoder.decode_hub_action(bt_message)
-		elif bt_message['type'] == 0x3:
-			Decoder.decode_hub_alert(bt_message)
-		elif bt_message['type'] == 0x4:
-			Decoder.decode_hub_attached_io(bt_message)
-		elif bt_message['type'] == 0x5:
-			Decoder.decode_generic_error(bt_message)
-		elif bt_message['type'] == 0x8:
-			Decoder.decode_hw_network_command(bt_message)
+		Decoder.add_readable(bt_message, Decoder.readable_message_type)
 
-
-		# Undocumented mario messages
-		#elif bt_message['type'] == 0x7:
-		#elif bt_message['type'] == 0xb:
-
-		elif bt_message['type'] == 0x43:
-			Decoder.decode_port_mode_info(bt_message)
-		elif bt_message['type'] == 0x44:
-			Decoder.decode_port_mode_info_request(bt_message)
-		elif bt_message['type'] == 0x45:
-			Decoder.decode_port_value_single(bt_message)
-		elif bt_message['type'] == 0x47:
-			Decoder.decode_port_input_format_single(bt_message)
-		elif bt_message['type'] == 0x82:
-			Decoder.decode_port_output_command_feedback(bt_message)
+		payload_decoder = Decoder.payload_decoders.get(bt_message['type'])
+		if payload_decoder:
+			payload_decoder(bt_message)
 		else:
 			bt_message['error'] = True
-			bt_message['readable'] += "No decoder for message: "+" ".join(hex(n) for n in message_bytes)
+			Decoder.add_readable(bt_message, lambda msg: "No decoder for message: "+" ".join(hex(n) for n in message_bytes))
 
 		return bt_message
 
+	def readable_message_type(bt_message):
+		return Decoder.int8_dict_to_str(Decoder.message_type_str, bt_message['type']) + " - "
+
 	def decode_hub_action(bt_message):
 		if len(bt_message['raw']) != 4:
-			bt_message['readable'] += "CORRUPTED MESSAGE: mesage len "+str(len(bt_message['raw']))+" is wrong for a hub action: "+" ".join(hex(n) for n in bt_message['raw'])
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: mesage len "+str(len(msg['raw']))+" is wrong for a hub action: "+" ".join(hex(n) for n in msg['raw']))
 			bt_message['error'] = True
 			return
 
 		bt_message['action'] = bt_message['raw'][3]
 		bt_message['action_str'] = Decoder.int8_dict_to_str(Decoder.hub_action_type, bt_message['action'])
-		bt_message['readable'] += "Hub action "+hex(bt_message['raw'][3])+ ":"+bt_message['action_str']
+		Decoder.add_readable(bt_message, lambda msg: "Hub action "+hex(msg['raw'][3])+ ":"+msg['action_str'])
 
 	def decode_port_output_command_feedback(bt_message):
 		payload = bt_message['raw'][3:]
 		# 0x5 0x0 0x82 [0x4 0xa]
 		if len(payload) % 2 != 0:
-			bt_message['readable'] += "CORRUPTED MESSAGE: length of payload "+str(len(payload))+" is not divisible by 2: "+" ".join(hex(n) for n in payload)
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: length of payload "+str(len(payload))+" is not divisible by 2: "+" ".join(hex(n) for n in payload))
+			bt_message['error'] = True
 			return
-		portcount = len(payload) / 2
-		retval = ""
 		bt_message['ports'] = []
 		for p in range(0, len(payload), 2):
-			bt_message['ports'].append({})
-			bt_message['ports'][p]['id'] = payload[p]
-
-			port_feedback_bitfield = payload[p+1]
+			bt_message['ports'].append({
+				'id': payload[p],
+				'feedback': payload[p+1]
+			})
+
+		if 'readable' in bt_message:
+			Decoder.readable_port_feedback(bt_message)
+		Decoder.add_readable(bt_message, Decoder.readable_port_output_command_feedback)
+
+	# Also fills in the per-port readables, which nothing needs until the message is read
+	def readable_port_feedback(bt_message):
+		for port_feedback_dict in bt_message['ports']:
+			port_feedback_bitfield = port_feedback_dict['feedback']
 			port_feedback = ""
 			if port_feedback_bitfield & 0x1:
 				port_feedback += " Empty&InProgress"
@@ -564,14 +600,18 @@ class Decoder():
 				port_feedback += " Idle"
 			if port_feedback_bitfield & 0x10:
 				port_feedback += " Busy/Full"
+			port_feedback_dict['readable'] = port_feedback
 
+	def readable_port_output_command_feedback(bt_message):
+		retval = ""
+		for port_feedback_dict in bt_message['ports']:
+			if not 'readable' in port_feedback_dict:
+				Decoder.readable_port_feedback(bt_message)
+			port_feedback = port_feedback_dict['readable']
 			if not port_feedback:
 				port_feedback = "(None)"
-				bt_message['ports'][p]['readable'] = ""
-			else:
-				bt_message['ports'][p]['readable'] = port_feedback
-			retval += "port:"+str(bt_message['ports'][p]['id'])+" feedback:"+port_feedback+" "
-		bt_message['readable'] += retval
+			retval += "port:"+str(port_feedback_dict['id'])+" feedback:"+port_feedback+" "
+		return retval
 
 	def decode_hub_properties(bt_message):
 		# 0x9 0x0 0x1 [ 0x3 0x6 0x0 0x0 0x3 0x51 ]
@@ -583,7 +623,6 @@ class Decoder():
 		property_involved_str = Decoder.int8_dict_to_str(Decoder.hub_property_str, property_involved)
 
 		bt_message['operation'] = payload[1]
-		property_operation_str = Decoder.int8_dict_to_str(Decoder.hub_property_op_str, payload[1])
 
 		# 0x9 0x0 0x1 0x3 0x6 [ 0x0 0x0 0x3 0x51 ]
 		# FIXME: Incomplete
@@ -604,7 +643,7 @@ class Decoder():
 		elif property_involved == 0x2:
 			# 5 + 1
 			if length != 6:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a boolean hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a boolean hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			if payload[2]:
@@ -618,7 +657,7 @@ class Decoder():
 		elif property_involved == 0x3:
 			# 5 + 4
 			if length != 9:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint32 hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint32 hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			property_value = Decoder.version_bytes_to_str(payload[2:])
@@ -627,7 +666,7 @@ class Decoder():
 		# 'HW Version'
 		elif property_involved == 0x4:
 			if length != 9:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint32 hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint32 hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			property_value = Decoder.version_bytes_to_str(payload[2:])
@@ -636,7 +675,7 @@ class Decoder():
 		# 'RSSI'
 		elif property_involved == 0x5:
 			if length != 6:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint8 hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint8 hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			property_value = str(int(payload[2]))
@@ -653,7 +692,7 @@ class Decoder():
 		# 'Battery Type'
 		elif property_involved == 0x7:
 			if length != 6:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a boolean hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a boolean hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			if payload[2]:
@@ -676,7 +715,7 @@ class Decoder():
 		#'LEGO Wireless Protocol Version'
 		elif property_involved == 0xa:
 			if length != 7:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint16 hub property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a uint16 hub property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			bt_message['value'] = Decoder.uint16_bytes_to_int(payload[2:])
@@ -686,7 +725,7 @@ class Decoder():
 		elif property_involved == 0xd:
 			# 5 + 6
 			if length != 11:
-				bt_message['readable'] += "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a MAC address property: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: payload len "+str(length)+" is wrong for a MAC address property: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 			property_value = ":".join(hexlify(n.to_bytes(1,byteorder='little')).decode('ascii') for n in payload[2:])
@@ -695,7 +734,7 @@ class Decoder():
 		# Mario Volume
 		elif property_involved == 0x12:
 			if payload[1] != 0x6:
-				bt_message['readable'] += "UNKNOWN VOLUME PREFIX IN MESSAGE: "+" ".join(hex(n) for n in payload)
+				Decoder.add_readable(bt_message, lambda msg: "UNKNOWN VOLUME PREFIX IN MESSAGE: "+" ".join(hex(n) for n in payload))
 				bt_message['error'] = True
 				return
 
@@ -704,10 +743,10 @@ class Decoder():
 			bt_message['value'] = int(payload[2])
 
 		else:
-			bt_message['readable'] += property_involved_str+" "+property_operation_str+" UNKNOWN remaining payload:"+" ".join(hex(n) for n in payload[2:])
+			Decoder.add_readable(bt_message, lambda msg: property_involved_str+" "+Decoder.int8_dict_to_str(Decoder.hub_property_op_str, payload[1])+" UNKNOWN remaining payload:"+" ".join(hex(n) for n in payload[2:]))
 			return
 
-		bt_message['readable'] += property_involved_str+" "+property_operation_str+": "+property_value
+		Decoder.add_readable(bt_message, lambda msg: property_involved_str+" "+Decoder.int8_dict_to_str(Decoder.hub_property_op_str, payload[1])+": "+property_value)
 
 	def decode_hub_alert(bt_message):
 		#0x6 0x0 0x3 [ 0x2 0x4 0x0 ]
@@ -717,28 +756,30 @@ class Decoder():
 		bt_message['operation'] = payload[1]
 
 		# Only "downstream" has boolean "alert payload"
-		status = "OK"
 		bt_message['status'] = False
 		if payload[2] == 0xff:
-			status = "ALERT!"
 			bt_message['status'] = True
 			bt_message['alert_type_str'] = Decoder.int8_dict_to_str(Decoder.hub_alert_type_str, payload[0])
 			bt_message['operation_str'] = Decoder.int8_dict_to_str(Decoder.hub_alert_op_str, payload[1])
-			bt_message['readable'] += f"Alert Status: {status} : type {bt_message['alert_type_str']} operation {bt_message['operation_str']}"
+			Decoder.add_readable(bt_message, lambda msg: f"Alert Status: ALERT! : type {msg['alert_type_str']} operation {msg['operation_str']}")
 		else:
-			bt_message['readable'] += f"Alert Status: {status}"
+			Decoder.add_readable(bt_message, "Alert Status: OK")
 
 	def decode_port_input_format_single(bt_message):
 		payload = bt_message['raw'][3:]
 		bt_message['port'] = payload[0]
 		bt_message['mode'] = payload[1]
 		bt_message['delta'] = int.from_bytes(payload[2:6], byteorder="little", signed=False)
-		notifications = " Notifications disabled"
 		bt_message['notifications'] = False
 		if ( payload[6] ):
-			notifications = " Notifications enabled"
 			bt_message['notifications'] = True
-		bt_message['readable'] += "port "+str(bt_message['port'])+" mode " + str(bt_message['mode']) + " delta interval for jitter filtering:"+str(bt_message['delta'])+notifications
+		Decoder.add_readable(bt_message, Decoder.readable_port_input_format_single)
+
+	def readable_port_input_format_single(bt_message):
+		notifications = " Notifications disabled"
+		if bt_message['notifications']:
+			notifications = " Notifications enabled"
+		return "port "+str(bt_message['port'])+" mode " + str(bt_message['mode']) + " delta interval for jitter filtering:"+str(bt_message['delta'])+notifications
 
 	def decode_hub_attached_io(bt_message):
 		payload = bt_message['raw'][3:]
@@ -748,8 +789,8 @@ class Decoder():
 		iotype = None
 		port = payload[0]
 		bt_message['port'] = port
-		event = Decoder.int8_dict_to_str(Decoder.io_event_type_str,payload[1])
 		bt_message['event'] = payload[1]
+		event = lambda: Decoder.int8_dict_to_str(Decoder.io_event_type_str,payload[1])
 		# --- --- --- 0x0 0x1 [0x47 0x0 0x0 0x0 0x3 0x51 0x1 0x0 0x0 0x0 ]
 		# attached
 		if io_size_indicator == 15:
@@ -758,7 +799,7 @@ class Decoder():
 			bt_message['hw_ver_str'] = hw_rev
 			sw_rev = Decoder.version_bytes_to_str(payload[8:12])
 			bt_message['sw_ver_str'] = sw_rev
-			bt_message['readable'] += "port "+str(port)+" "+event+" IOTypeID:"+str(bt_message['io_type_id'])+" hw:"+hw_rev+" sw:"+sw_rev
+			Decoder.add_readable(bt_message, lambda msg: "port "+str(port)+" "+event()+" IOTypeID:"+str(msg['io_type_id'])+" hw:"+hw_rev+" sw:"+sw_rev)
 		# attached_virtual
 		elif io_size_indicator == 9:
 			iotype = 'virtual_attached'
@@ -767,22 +808,25 @@ class Decoder():
 			bt_message['virt_a'] = port_a
 			port_b = payload[5]
 			bt_message['virt_b'] = port_b
-			bt_message['readable'] += "port "+str(port)+" "+event+" IOTypeID:"+str(bt_message['io_type_id'])+" Port A:"+str(port_a)+" Port B:"+str(port_b)
+			Decoder.add_readable(bt_message, lambda msg: "port "+str(port)+" "+event()+" IOTypeID:"+str(msg['io_type_id'])+" Port A:"+str(port_a)+" Port B:"+str(port_b))
 		#  detached
 		elif io_size_indicator == 5:
 			# no more bytes to deal with!
-			bt_message['readable'] += "port "+str(port)+" "+event
+			Decoder.add_readable(bt_message, lambda msg: "port "+str(port)+" "+event())
 		else:
 			bt_message['error'] = True
-			bt_message['readable'] += "INVALID IO LENGTH ("+str(io_size_indicator)+"):  "+" ".join(hex(n) for n in payload)
+			Decoder.add_readable(bt_message, lambda msg: "INVALID IO LENGTH ("+str(io_size_indicator)+"):  "+" ".join(hex(n) for n in payload))
 
 	def decode_generic_error(bt_message):
 		if len(bt_message['raw']) != 5:
-			bt_message['readable'] += "CORRUPTED MESSAGE: message len "+str(len(bt_message['raw']))+" is wrong for a hub error: "+" ".join(hex(n) for n in bt_message['raw'])
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: message len "+str(len(msg['raw']))+" is wrong for a hub error: "+" ".join(hex(n) for n in msg['raw']))
 			bt_message['error'] = True
 			return
 
 		bt_message['error'] = True
+		Decoder.add_readable(bt_message, Decoder.readable_generic_error)
+
+	def readable_generic_error(bt_message):
 		error_cause = bt_message['raw'][3]
 		error_code = bt_message['raw'][4]
 		readable = hex(error_code)
@@ -792,33 +836,33 @@ class Decoder():
 			error_cause = Decoder.message_type_str[error_cause]
 		else:
 			error_cause = hex(error_cause)
-		bt_message['readable'] += "Command "+error_cause+" caused error: "+readable
+		return "Command "+error_cause+" caused error: "+readable
 
 	def decode_hw_network_command(bt_message):
 		if len(bt_message['raw']) != 5 and len(bt_message['raw']) != 4:
-			bt_message['readable'] += "CORRUPTED MESSAGE: message len "+str(len(bt_message['raw']))+" is wrong for a hw network command (4 or 5): "+" ".join(hex(n) for n in bt_message['raw'])
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: message len "+str(len(msg['raw']))+" is wrong for a hw network command (4 or 5): "+" ".join(hex(n) for n in msg['raw']))
 			bt_message['error'] = True
 			return
 		payload = bt_message['raw'][3:]
 
 		command_token = payload[0]
 		if command_token in Decoder.hw_network_command_type:
-			bt_message['readable'] += " command: "+Decoder.hw_network_command_type[command_token]
+			Decoder.add_readable(bt_message, lambda msg: " command: "+Decoder.hw_network_command_type[command_token])
 
 		# Connection Request
 		if command_token == 0x2:
 			# Button State
 			if payload[1] == 0x0:
-				bt_message['readable'] += ": Button Released"
+				Decoder.add_readable(bt_message, ": Button Released")
 				bt_message['command'] = "connection_request"
 				bt_message['value'] = "button_up"
 			elif payload[1] == 0x1:
-				bt_message['readable'] += ": Button Pressed"
+				Decoder.add_readable(bt_message, ": Button Pressed")
 				bt_message['command'] = "connection_request"
 				bt_message['value'] = "button_down"
 			else:
 				bt_message['error'] = True
-				bt_message['readable'] += ": INVALID BUTTON STATE "+hex(payload[1])
+				Decoder.add_readable(bt_message, lambda msg: ": INVALID BUTTON STATE "+hex(payload[1]))
 		# Family Request
 		elif command_token == 0x3:
 			# This doesn't have a payload
@@ -826,12 +870,12 @@ class Decoder():
 			# So, only sent on relatively quick tap of the pairing button
 			bt_message['command'] = "family_request"
 		else:
-			bt_message['readable'] += " hw command payload: "+" ".join(hex(n) for n in payload)
+			Decoder.add_readable(bt_message, lambda msg: " hw command payload: "+" ".join(hex(n) for n in payload))
 
 	def decode_port_mode_info(bt_message):
 		#0x8 0x0 0x43 [ 0x0 0x0 0x5 0x84 0x0 ]
 		payload = bt_message['raw'][3:]
-		bt_message['readable'] += "port "+str(payload[0])
+		Decoder.add_readable(bt_message, lambda msg: "port "+str(payload[0]))
 		bt_message['port'] = payload[0]
 
 		# Mode info
@@ -860,14 +904,11 @@ class Decoder():
 			else:
 				bt_message['port_mode_capabilities']['logic_synchronizeable'] = False
 
-			bt_message['readable'] += " capabilities: "+hex(payload[2])
-			bt_message['readable'] += " mode count: "+str(bt_message['num_modes'])
 			input_bitfield = Decoder.uint16_bytes_to_int(payload[4:6])
 			output_bitfield = Decoder.uint16_bytes_to_int(payload[6:8])
-			bt_message['readable'] += " input modes available (bitmask): "+str(input_bitfield)
-			bt_message['readable'] += " output modes available (bitmask): "+str(output_bitfield)
 			bt_message['input_bitfield'] = input_bitfield
 			bt_message['output_bitfield'] = output_bitfield
+			Decoder.add_readable(bt_message, lambda msg: " capabilities: "+hex(payload[2])+" mode count: "+str(msg['num_modes'])+" input modes available (bitmask): "+str(input_bitfield)+" output modes available (bitmask): "+str(output_bitfield))
 
 		# Mode combinations
 		elif payload[1] == 0x2:
@@ -875,9 +916,13 @@ class Decoder():
 			combi_count = len(combi_modes) / 2
 			combi_index = 0
 			if combi_count >= 1:
-				bt_message['readable'] += " mode combinations: "
+				combi_values = []
 				while combi_index < combi_count:
-					combi_value = Decoder.uint16_bytes_to_int(combi_modes[combi_index:2])
+					combi_value = Decoder.uint16_bytes_to_int(combi_modes[combi_index*2:combi_index*2+2])
+					# Some hubs pad the list out with empty combinations
+					if not combi_value:
+						break
+					combi_values.append(combi_value)
 
 					modes_in_combi = []
 					bit_value = 1
@@ -892,13 +937,13 @@ class Decoder():
 						bt_message['mode_combinations'] = {}
 					bt_message['mode_combinations'][combi_index] = tuple(modes_in_combi)
 
-					bt_message['readable'] += f'Combination {combi_index}: {combi_value:016b}'
 					combi_index += 1
+				Decoder.add_readable(bt_message, lambda msg: " mode combinations: "+"".join(f'Combination {i}: {v:016b}' for i, v in enumerate(combi_values)))
 			else:
 				if len(combi_modes) > 0:
-					bt_message['readable'] += " Undecipherable combi mode information:"+" ".join(hex(n) for n in combi_modes)
+					Decoder.add_readable(bt_message, lambda msg: " Undecipherable combi mode information:"+" ".join(hex(n) for n in combi_modes))
 				else:
-					bt_message['readable'] += " Mode has no combos"
+					Decoder.add_readable(bt_message, " Mode has no combos")
 
 	def decode_port_mode_info_request(bt_message):
 		#0x8 0x0 0x44 [ 0x0 0x0 0x5 0x84 0x0 ]
@@ -924,27 +969,27 @@ class Decoder():
 		#luigi port_mode_info port 0 mode 0 infotype: MAPPING0x84: 0x0
 		#luigi port_mode_info port 0 mode 0 infotype: VALUE_FORMAT0x3: 0x0: 0x3: 0x0
 
-		bt_message['readable'] += "port "+str(port)+" mode " + str(mode) + " infotype: " + Decoder.int8_dict_to_str(Decoder.mode_info_type_str,mode_info_type) + " "
+		Decoder.add_readable(bt_message, lambda msg: "port "+str(port)+" mode " + str(mode) + " infotype: " + Decoder.int8_dict_to_str(Decoder.mode_info_type_str,mode_info_type) + " ")
 		if mode_info_type == 0x0:
 			# NAME
 			bt_message['name'] = Decoder.string_and_strip_trailing_null(payload[3:])
-			bt_message['readable'] += bt_message['name']
+			Decoder.add_readable(bt_message, lambda msg: msg['name'])
 		# Assuming this is FP32 for FLOAT
 		elif mode_info_type == 0x1:
 			# RAW
-			bt_message['readable'] += ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11])
+			Decoder.add_readable(bt_message, lambda msg: ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11]))
 			bt_message['raw'] = {}
 			bt_message['raw']['min'] = struct.unpack('f', payload[3:7])[0]
 			bt_message['raw']['max'] = struct.unpack('f', payload[7:11])[0]
 		elif mode_info_type == 0x2:
 			# PCT (Percentage)
-			bt_message['readable'] += ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11])
+			Decoder.add_readable(bt_message, lambda msg: ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11]))
 			bt_message['pct'] = {}
 			bt_message['pct']['min'] = struct.unpack('f', payload[3:7])[0]
 			bt_message['pct']['max'] = struct.unpack('f', payload[7:11])[0]
 		elif mode_info_type == 0x3:
 			# SI (?Systeme International?)
-			bt_message['readable'] += ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11])
+			Decoder.add_readable(bt_message, lambda msg: ' Min:'+' '.join(hex(n) for n in payload[3:7])+' Max:'+' '.join(hex(n) for n in payload[7:11]))
 			bt_message['si'] = {}
 			bt_message['si']['min'] = struct.unpack('f', payload[3:7])[0]
 			bt_message['si']['max'] = struct.unpack('f', payload[7:11])[0]
@@ -954,28 +999,22 @@ class Decoder():
 			if bt_message['symbol'] == None:
 				bt_message['symbol'] = 'ERR_NO_SYMBOL_FOR_PORT'
 
-			bt_message['readable'] += bt_message['symbol']
+			Decoder.add_readable(bt_message, lambda msg: msg['symbol'])
 
 		elif mode_info_type == 0x5:
 			# Mapping, 16 bits
 			# IN as in to read-IN, OUT as in to write-OUT
-			def readable_mapping_bits(eightbits, direction, bt_message):
-				#retval = f'{direction} {eightbits:08b}: '
-				retval = f'{direction}: '
+			def decode_mapping_bits(eightbits, direction, bt_message):
 				maptype = ''
 				if (eightbits & 0x80) >> 7:
-					retval += 'NULLable '
 					bt_message[direction+'_nullable'] = True
 				else:
 					bt_message[direction+'_nullable'] = False
 
 				if (eightbits & 0x40) >> 6:
-					retval += 'FunctionalMapping2 '
 					bt_message[direction+'_mapping'] = True
 				else:
 					bt_message[direction+'_mapping'] = False
-				if (eightbits & 0x20) >> 5:
-					retval += 'whatisbitfive '
 
 				if (eightbits & 0x10) >> 4:
 					maptype += 'ABS '
@@ -984,16 +1023,26 @@ class Decoder():
 				if (eightbits & 0x4) >> 2:
 					maptype += 'DIS '
 
+				bt_message[direction+'_maptype'] = maptype.strip()
+
+			def readable_mapping_bits(eightbits, direction):
+				#retval = f'{direction} {eightbits:08b}: '
+				retval = f'{direction}: '
+				if (eightbits & 0x80) >> 7:
+					retval += 'NULLable '
+				if (eightbits & 0x40) >> 6:
+					retval += 'FunctionalMapping2 '
+				if (eightbits & 0x20) >> 5:
+					retval += 'whatisbitfive '
 				if (eightbits & 0x2) >> 1:
 					retval += 'whatisbittwo '
 				if (eightbits & 0x1):
 					retval += 'whatisbitone '
-
-				bt_message[direction+'_maptype'] = maptype.strip()
-
 				return retval
-			bt_message['readable'] += readable_mapping_bits(payload[3], 'IN', bt_message)
-			bt_message['readable'] += readable_mapping_bits(payload[4], 'OUT', bt_message)
+
+			decode_mapping_bits(payload[3], 'IN', bt_message)
+			decode_mapping_bits(payload[4], 'OUT', bt_message)
+			Decoder.add_readable(bt_message, lambda msg: readable_mapping_bits(payload[3], 'IN')+readable_mapping_bits(payload[4], 'OUT'))
 
 		elif mode_info_type == 0x7:
 			# Motor Bias, 8 bits, 0-100%
@@ -1002,7 +1051,7 @@ class Decoder():
 			# Capability bits 8[6]
 			# FIXME: Well, good luck, the documents state something to the
 			# effect of "your documentation is in another castle" in section 3.20.1
-			bt_message['readable'] += ' Capabilities:'+' '.join(hex(n) for n in payload[3:9])
+			Decoder.add_readable(bt_message, lambda msg: ' Capabilities:'+' '.join(hex(n) for n in payload[3:9]))
 
 		elif mode_info_type == 0x80:
 			# Value Format
@@ -1019,28 +1068,57 @@ class Decoder():
 				bt_message['dataset_type'] = 'UNKNOWN'
 			bt_message['total_figures'] = payload[5]
 			bt_message['decimals'] = payload[6]
-			bt_message['readable'] += " Datasets: "+str(bt_message['datasets'])+" Type: "+bt_message['dataset_type']+" Decimals: "+str(bt_message['decimals'])
+			Decoder.add_readable(bt_message, lambda msg: " Datasets: "+str(msg['datasets'])+" Type: "+msg['dataset_type']+" Decimals: "+str(msg['decimals']))
 		else:
-			bt_message['readable'] += " ".join(hex(n) for n in payload[3:])
+			Decoder.add_readable(bt_message, lambda msg: " ".join(hex(n) for n in payload[3:]))
 
 	def decode_port_value_single(bt_message):
+		# Only slice once, this is the hot path for sensor data
+		bt_message['port'] = bt_message['raw'][3]
+		bt_message['value'] = bt_message['raw'][4:]
+		Decoder.add_readable(bt_message, Decoder.readable_port_value_single)
+
+	def readable_port_value_single(bt_message):
+		return "port "+str(bt_message['port'] )+": "+" ".join(hex(n) for n in bt_message['value'])
+
+	def decode_port_value_combi(bt_message):
+		#0xa 0x0 0x46 [ 0x0 0x3 0x0 0x5 0x0 0x12 0x34 ]
+		# Port, then a 16-bit pointer with a bit set for each Mode/DataSet entry (from the 0x42 setup) that has a value in this packet
+		if len(bt_message['raw']) < 6:
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: message len "+str(len(msg['raw']))+" is too short for a combined port value: "+" ".join(hex(n) for n in msg['raw']))
+			bt_message['error'] = True
+			return
+		bt_message['port'] = bt_message['raw'][3]
+		bt_message['pointer'] = Decoder.uint16_bytes_to_int(bt_message['raw'][4:6])
+		bt_message['value'] = bt_message['raw'][6:]
+		Decoder.add_readable(bt_message, Decoder.readable_port_value_combi)
+
+	def readable_port_value_combi(bt_message):
+		return "port "+str(bt_message['port'])+f" pointer {bt_message['pointer']:016b}: "+" ".join(hex(n) for n in bt_message['value'])
+
+	def decode_port_input_format_combi(bt_message):
+		#0x7 0x0 0x48 [ 0x0 0x80 0x3 0x0 ]
+		if len(bt_message['raw']) != 7:
+			Decoder.add_readable(bt_message, lambda msg: "CORRUPTED MESSAGE: message len "+str(len(msg['raw']))+" is wrong for a combined input format: "+" ".join(hex(n) for n in msg['raw']))
+			bt_message['error'] = True
+			return
 		payload = bt_message['raw'][3:]
 		bt_message['port'] = payload[0]
-		bt_message['value'] = payload[1:]
-		bt_message['readable'] += "port "+str(bt_message['port'] )+": "+" ".join(hex(n) for n in payload[1:])
+		# Bit 7: multi-update, bits 0-6: the combination index in use
+		bt_message['combination_index'] = payload[1] & 0x7f
+		bt_message['multi_update'] = False
+		if payload[1] & 0x80:
+			bt_message['multi_update'] = True
+		bt_message['pointer'] = Decoder.uint16_bytes_to_int(payload[2:4])
+		Decoder.add_readable(bt_message, lambda msg: "port "+str(msg['port'])+" combination "+str(msg['combination_index'])+f" Mode/DataSet pointer {msg['pointer']:016b}"+(" multi-update enabled" if msg['multi_update'] else " multi-update disabled"))
 
-	def decode_wdx_packet(message_bytes, source_char_uuid):
+	def decode_wdx_packet(message_bytes, source_char_uuid, lazy_readable=False):
 
-		bt_message = {
-			'char_uuid': source_char_uuid,
-			'error': False,
-			'raw':message_bytes,
-			'readable': ''
-		}
+		bt_message = Decoder.new_bt_message(message_bytes, source_char_uuid, lazy_readable)
 
 		if len(bt_message['raw']) < 2:
 			bt_message['error'] = True
-			bt_message['readable'] += ": WDX Packet of insufficent length"
+			Decoder.add_readable(bt_message, ": WDX Packet of insufficent length")
 			return bt_message
 
 		bt_message['wdx'] = {}
@@ -1049,11 +1127,11 @@ class Decoder():
 			bt_message['wdx']['type'] = Decoder.wdx_message_types[packet_type]
 			if packet_type != 3:
 				bt_message['error'] = True
-				bt_message['readable'] += ": WDX Packet decoder only fit to decode response packets"
+				Decoder.add_readable(bt_message, ": WDX Packet decoder only fit to decode response packets")
 				return bt_message
 		else:
 			bt_message['error'] = True
-			bt_message['readable'] += f': Unknown WDX packet type {packet_type}'
+			Decoder.add_readable(bt_message, lambda msg: f': Unknown WDX packet type {packet_type}')
 			return bt_message
 
 		register = bt_message['raw'][1]
@@ -1061,7 +1139,7 @@ class Decoder():
 			bt_message['wdx']['register'] = Decoder.wdx_registers[register]
 		else:
 			bt_message['error'] = True
-			bt_message['readable'] += f': Unknown WDX register {register} / {hex(register)}'
+			Decoder.add_readable(bt_message, lambda msg: f': Unknown WDX register {register} / {hex(register)}')
 			return bt_message
 
 
@@ -1070,42 +1148,37 @@ class Decoder():
 
 			if register == 0x20:
 				bt_message['value'] = int.from_bytes(message_bytes[2:], byteorder="little", signed=False)
-				bt_message['readable'] = f"Battery SoC: {bt_message['value']}"
+				Decoder.set_readable(bt_message, lambda msg: f"Battery SoC: {msg['value']}")
 
 			elif register == 0x21:
 				bt_message['value'] = Decoder.string_and_strip_trailing_null(message_bytes[2:])
-				bt_message['readable'] = f"Device Model: {bt_message['value']}"
+				Decoder.set_readable(bt_message, lambda msg: f"Device Model: {msg['value']}")
 
 			elif register == 0x22:
 				bt_message['value'] = Decoder.string_and_strip_trailing_null(message_bytes[2:])
-				bt_message['readable'] = f"Firmware: {bt_message['value']}"
+				Decoder.set_readable(bt_message, lambda msg: f"Firmware: {msg['value']}")
 
 			elif register == 0x80:
 				bt_message['value'] = Decoder.string_and_strip_trailing_null(message_bytes[2:])
-				bt_message['readable'] = f"Local Name: {bt_message['value']}"
+				Decoder.set_readable(bt_message, lambda msg: f"Local Name: {msg['value']}")
 
 			elif register == 0x81:
 				bt_message['value'] = int.from_bytes(message_bytes[2:], byteorder="little", signed=False)
-				bt_message['readable'] = f"Sound Volume: {bt_message['value']}"
+				Decoder.set_readable(bt_message, lambda msg: f"Sound Volume: {msg['value']}")
 
 			else:
-				bt_message['value'] = bt_message['raw'][2:]
-				bt_message['readable'] = f"{bt_message['wdx']['type']}:{bt_message['wdx']['register']} value {bt_message['value']}"
+				bt_message['value'] = bytearray(bt_message['raw'][2:])
+				Decoder.set_readable(bt_message, lambda msg: f"{msg['wdx']['type']}:{msg['wdx']['register']} value {msg['value']}")
 
 		else:
-			bt_message['value'] = bt_message['raw'][2:]
-			bt_message['readable'] = f"{bt_message['wdx']['type']}:{bt_message['wdx']['register']} value {bt_message['value']}"
+			bt_message['value'] = bytearray(bt_message['raw'][2:])
+			Decoder.set_readable(bt_message, lambda msg: f"{msg['wdx']['type']}:{msg['wdx']['register']} value {msg['value']}")
 
 		return bt_message
 
-	def decode_wedo2_packet(message_bytes, source_char_uuid):
+	def decode_wedo2_packet(message_bytes, source_char_uuid, lazy_readable=False):
 
-		bt_message = {
-			'char_uuid': source_char_uuid,
-			'error': False,
-			'raw':message_bytes,
-			'readable': ''
-		}
+		bt_message = Decoder.new_bt_message(message_bytes, source_char_uuid, lazy_readable)
 
 		# FIXME: Where to put these constants?
 		hub_attached_io_ = '00001527-1212-efde-1523-785feabcd123'
@@ -1139,29 +1212,29 @@ class Decoder():
 
 			bt_message['port'] = message_bytes[0]
 			bt_message['event'] = message_bytes[1]
-			event_readable = Decoder.int8_dict_to_str(Decoder.io_event_type_str,bt_message['event'])
+			event_readable = lambda: Decoder.int8_dict_to_str(Decoder.io_event_type_str,bt_message['event'])
 			# FIXME: needs a decoder for this readable
-			bt_message['readable'] = "hub_attached_io"
+			Decoder.set_readable(bt_message, "hub_attached_io")
 			if bt_message['event'] == 0x0:
-				bt_message['readable'] += f" {event_readable} on port {bt_message['port']}"
+				Decoder.add_readable(bt_message, lambda msg: f" {event_readable()} on port {msg['port']}")
 			elif bt_message['event'] == 0x1:
 				if len(bt_message['raw']) == 12:
 					bt_message['io_type_id'] = message_bytes[3]
-					bt_message['readable'] += f" {event_readable} {Decoder.io_type_id_str[bt_message['io_type_id']]} on port {bt_message['port']}"
+					Decoder.add_readable(bt_message, lambda msg: f" {event_readable()} {Decoder.io_type_id_str[msg['io_type_id']]} on port {msg['port']}")
 				else:
-					bt_message['readable'] += f" {event_readable} UNKNOWN DATA"
+					Decoder.add_readable(bt_message, lambda msg: f" {event_readable()} UNKNOWN DATA")
 
 		# RGB handily sends this on first start_notify() for the UUID
 		elif bt_message['char_uuid'].lower() == port_mode_info.lower():
 			bt_message['type'] = 0x44 # Signal PMI
 
-			bt_message['readable'] = Decoder.int8_dict_to_str(Decoder.message_type_str, bt_message['type']) + " - "
+			Decoder.set_readable(bt_message, Decoder.readable_message_type)
 
 			bt_message['pmi_revision'] = message_bytes[0]
 			bt_message['port'] = message_bytes[1]	# ConnectID in SDK
 			bt_message['io_type_id'] = message_bytes[2]
 			bt_message['mode'] = message_bytes[3]
-			bt_message['readable'] += f"{Decoder.io_type_id_str[bt_message['io_type_id']]} port {bt_message['port']} mode {bt_message['mode']}"
+			Decoder.add_readable(bt_message, lambda msg: f"{Decoder.io_type_id_str[msg['io_type_id']]} port {msg['port']} mode {msg['mode']}")
 			bt_message['delta'] = int.from_bytes(message_bytes[4:8], byteorder="little", signed=False)
 			if message_bytes[8] == 0x0:	# This byte is "unit" in the SDK
 				bt_message['mode_info_type_readable'] = 'RAW'
@@ -1177,6 +1250,28 @@ class Decoder():
 
 		return bt_message
 
+	# message_type_str index -> decoder for decode_payload
+	payload_decoders = {
+		0x1: decode_hub_properties,
+		0x2: decode_hub_action,
+		0x3: decode_hub_alert,
+		0x4: decode_hub_attached_io,
+		0x5: decode_generic_error,
+		0x8: decode_hw_network_command,
+
+		# Undocumented mario messages
+		#0x7:
+		#0xb:
+
+		0x43: decode_port_mode_info,
+		0x44: decode_port_mode_info_request,
+		0x45: decode_port_value_single,
+		0x46: decode_port_value_combi,
+		0x47: decode_port_input_format_single,
+		0x48: decode_port_input_format_combi,
+		0x82: decode_port_output_command_feedback,
+	}
+
 	# --- Utilities
 
 	def int8_dict_to_str(int8_dict,int8_value):
@@ -1211,7 +1306,7 @@ class Decoder():
 		return "v"+str(major)+"."+str(minor)+"."+str(fix)+"."+str(build)
 
 	def string_and_strip_trailing_null(str_bytearray):
-		unicode_str = str_bytearray.decode()
+		unicode_str = bytes(str_bytearray).decode()
 		while unicode_str[-1] == '\u0000' and len(unicode_str) > 1:
 			unicode_str = unicode_str[:-1]
 		if unicode_str == '\u0000':
@@ -14,6 +14,10 @@ class DuploTrain(BLE_LWP_Device):
 
 		self.mode_probe_ignored_info_types = ( 0x7, 0x8 )	# Doesn't support motor bias or capability bits
 
+		# Falls over easily when interrogated
+		self.mode_probe_rate_limit = 0.5
+		self.mode_probe_burst = 1
+
 	# "ONSEC"
 	# stalls it out
 	# Index: Port Type per Decoder.io_type_id_str index, value: attached hardware port identifier (int or tuple)
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+class GATTTokenBucket():
+
+	def __init__(self, interval, burst=1):
+		"""
+		interval:
+			Seconds per GATT write once the burst is used up (gatt_send_rate_limit)
+		burst:
+			How many writes can go out back to back before they're paced
+
+		Hubs drop writes that show up too fast, so BLE_Device awaits acquire()
+		before each write.  Writes on the same characteristic are already
+		awaited in order, so this just spaces them out.
+		"""
+		self.interval = interval
+		self.burst = burst
+		self.tokens = burst
+		self.last_refill = time.monotonic()
+
+		# Counters for dump_status
+		self.sent = 0
+		self.delayed = 0
+		self.delayed_seconds = 0.0
+
+	def _refill(self, now):
+		if self.interval > 0:
+			self.tokens = min(self.burst, self.tokens + (now - self.last_refill) / self.interval)
+		else:
+			self.tokens = self.burst
+		self.last_refill = now
+
+	async def acquire(self):
+		self._refill(time.monotonic())
+
+		# Take the token now, even if it isn't there yet, so anyone else
+		# waiting on this bucket queues up behind it
+		self.tokens -= 1
+		self.sent += 1
+		if self.tokens < 0:
+			wait = -self.tokens * self.interval
+			self.delayed += 1
+			self.delayed_seconds += wait
+			await asyncio.sleep(wait)
+
+	def stats(self):
+		return {
+			'sent': self.sent,
+			'delayed': self.delayed,
+			'delayed_seconds': round(self.delayed_seconds, 3)
+		}
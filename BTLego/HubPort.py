@@ -1,6 +1,7 @@
 from .HubPortReported import HubPortReported
 from .HubPortModeInfo import HubPortModeInfo
 import logging
+import time
 
 class HubPort():
 
@@ -16,6 +17,8 @@ class HubPort():
 		self.mode_probes_running = False
 		self.reported = HubPortReported()	# Stuff set by PMI
 
+		self.reset_output_flow()
+
 	def set_parent_info(self, class_name, system_type):
 		self.parent['hub_driver'] = class_name
 		self.parent['type'] = system_type
@@ -28,6 +31,94 @@ class HubPort():
 
 	def detach_device(self):
 		self.attached_device.status = 0x0		# Decoder.io_event_type_str[0x0]
+		self.reset_output_flow()
+
+	def reset_output_flow(self):
+		# Port output command (0x81) flow control, driven by the command feedback (0x82)
+		self.output_in_flight = 0		# Sent, but the port hasn't said they're done
+		self.output_busy = False		# Port reported Busy/Full
+		self.output_held = []			# [ payload, target, coalesce_key ] waiting to be sent
+		self.output_last_activity = 0.0
+
+	def hold_output_command(self, payload, target, coalesce_key, max_in_flight, feedback_timeout):
+		"""
+		Returns True if the port output command has to wait for the port to
+		free up, in which case it's held until process_output_feedback()
+		releases it.  A held command with the same coalesce_key is replaced
+		instead, since only the latest of those matters.
+
+		Otherwise the command is counted as in flight and should be sent
+		"""
+		now = time.monotonic()
+		if (self.output_in_flight or self.output_busy) and now - self.output_last_activity > feedback_timeout:
+			# Never heard back, don't wait forever
+			self.output_in_flight = 0
+			self.output_busy = False
+
+		# Startup information upper nibble: 0x0 buffer if necessary, 0x1 execute immediately
+		if payload[4] & 0x10:
+			# Goes straight past the buffer on the hub, so it also supersedes anything held like it
+			if coalesce_key is not None:
+				self.output_held = [ held for held in self.output_held if held[2] != coalesce_key ]
+			self.output_in_flight += 1
+			self.output_last_activity = now
+			return False
+
+		if self.output_held or self.output_busy or self.output_in_flight >= max_in_flight:
+			if coalesce_key is not None:
+				for held in self.output_held:
+					if held[2] == coalesce_key:
+						held[0] = payload
+						held[1] = target
+						return True
+			self.output_held.append([payload, target, coalesce_key])
+			return True
+
+		self.output_in_flight += 1
+		self.output_last_activity = now
+		return False
+
+	def process_output_feedback(self, feedback, max_in_flight):
+		"""
+		Update the flow control with the port's feedback bitfield (LWP 3.28)
+		and return the held [ payload, target, coalesce_key ] that can be sent now
+		"""
+		if feedback & 0x8:
+			# Idle
+			self.output_in_flight = 0
+		elif feedback & 0x1:
+			# Buffer empty, one command in progress
+			if self.output_in_flight > 1:
+				self.output_in_flight = 1
+		elif feedback & 0x6:
+			# Completed or discarded
+			if self.output_in_flight:
+				self.output_in_flight -= 1
+
+		self.output_busy = bool(feedback & 0x10)
+		self.output_last_activity = time.monotonic()
+
+		return self._release_held_output(max_in_flight)
+
+	def release_stalled_output(self, max_in_flight, feedback_timeout):
+		"""
+		For when the feedback never shows up: after feedback_timeout seconds
+		without any, stop waiting on it and return the held commands that can
+		be sent now
+		"""
+		if time.monotonic() - self.output_last_activity >= feedback_timeout:
+			self.output_in_flight = 0
+			self.output_busy = False
+		return self._release_held_output(max_in_flight)
+
+	def _release_held_output(self, max_in_flight):
+		released = []
+		while self.output_held and not self.output_busy and self.output_in_flight < max_in_flight:
+			released.append(self.output_held.pop(0))
+			self.output_in_flight += 1
+		if released:
+			self.output_last_activity = time.monotonic()
+		return released
 
 	def dump_info(self):
 		retval = {}
@@ -43,6 +134,8 @@ class HubPort():
 			retval['fw'] = self.attached_device.fw_ver_str
 		else:
 			retval['device_detached'] = True
+		if self.output_held:
+			retval['output_commands_held'] = len(self.output_held)
 		retval['virtual_port_capable']= self.reported.virtual_port_capable
 		if self.reported.mode_combinations:
 			retval['mode_combinations'] = self.reported.mode_combinations
@@ -52,6 +145,66 @@ class HubPort():
 			retval['modes'][mode] = self.reported.modes[mode].dump_info()
 		return retval
 
+	def cache_info(self):
+		"""
+		What the port reported about the attached device, for PortInfoCache.
+		None if the probe isn't finished, since a partial answer would stop
+		the next interrogation from asking for the rest
+		"""
+		if not self.attached_device or self.mode_probes_running or not self.reported.modes:
+			return None
+		if self.reported.mode_combinations_requested and self.reported.mode_combinations is None:
+			return None
+		for mode in self.reported.modes:
+			if self.reported.modes[mode].mode_requests:
+				return None
+
+		retval = {}
+		retval['virtual_port_capable'] = self.reported.virtual_port_capable
+		if self.reported.mode_combinations:
+			# JSON keys are strings, so keep the combination index in the list
+			retval['mode_combinations'] = [ [combi_index, list(modes)] for combi_index, modes in self.reported.mode_combinations.items() ]
+		else:
+			retval['mode_combinations'] = self.reported.mode_combinations
+		retval['mode_count'] = self.reported.mode_count
+		retval['modes'] = [ self.reported.modes[mode].cache_info() for mode in self.reported.modes ]
+		return retval
+
+	# Same result as request_port_info() and processing all the replies, without
+	# the replies.  info is from cache_info()
+	# If info is bad, raises with the port and the attached device as they were
+	# before the probe, ready for request_port_info()
+	def load_cache_info(self, info, gatt_payload_writer):
+		self.reset_mode_info()
+
+		device_state = None
+		if self.attached_device:
+			device_state = self.attached_device.port_info_state()
+		try:
+			self._load_cache_info(info, gatt_payload_writer)
+		except Exception:
+			self.reset_mode_info()
+			if device_state:
+				self.attached_device.restore_port_info_state(device_state)
+			raise
+
+	def _load_cache_info(self, info, gatt_payload_writer):
+		self.reported.virtual_port_capable = info['virtual_port_capable']
+		self.reported.mode_count = info['mode_count']
+		for mode_info in info['modes']:
+			mode = mode_info['mode']
+			self.reported.modes[mode] = HubPortModeInfo(self.port_number, mode)
+			self.reported.modes[mode].load_cache_info(mode_info)
+			value_format = self.reported.modes[mode].value_format
+			if value_format and self.attached_device:
+				self.attached_device.set_mode_value_format(mode, value_format[0], value_format[1])
+
+		if info['mode_combinations'] is not None:
+			self.reported.mode_combinations_requested = True
+			self.reported.mode_combinations = { combi_index: tuple(modes) for combi_index, modes in info['mode_combinations'] }
+			if self.attached_device:
+				self.attached_device.set_mode_combinations(self.reported.mode_combinations, gatt_payload_writer)
+
 	def request_port_info(self, gatt_payload_writer):
 		gatt_payload_writer(HubPort.payload_for_port_info(self.port_number, 0x1), 'port_config')
 		self.mode_probes_running = True
@@ -91,6 +244,9 @@ class HubPort():
 				self.reported.mode_combinations = bt_message['mode_combinations']
 			else:
 				self.logger.error(f'Mode combinations NOT DECODED: {bt_message["readable"]}')
+			if self.attached_device:
+				# Let the device finish any combined mode subscription that was waiting on these
+				self.attached_device.set_mode_combinations(self.reported.mode_combinations, gatt_payload_writer)
 			return
 		else:
 			self.logger.debug(f"Interrogating mode info for {bt_message['num_modes']} modes on port {port}: {self.attached_device.name}")
@@ -111,6 +267,7 @@ class HubPort():
 		if bt_message['port_mode_capabilities']['logic_combineable']:
 			# This is a signal to check for combinations (3.15.2)
 			self.logger.debug(f'\tRequest port {port} combinations...')
+			self.reported.mode_combinations_requested = True
 			gatt_payload_writer(HubPort.payload_for_port_info(port, 0x2),'port_config')
 
 		def scan_mode(direction, port, mode):
@@ -179,6 +336,20 @@ class HubPort():
 			mode_number += 1
 
 
+	# bt_message is a port_mode_info_req response
+	# Returns False if the mode wasn't reported by the port info
+	def process_mode_info_message(self, bt_message):
+		mode = bt_message['mode']
+		if not mode in self.reported.modes:
+			return False
+
+		self.reported.modes[mode].process_mode_info_request(bt_message)
+
+		if bt_message['mode_info_type'] == 0x80 and self.attached_device:
+			# Decode port values with the format the mode actually reports
+			self.attached_device.set_mode_value_format(mode, bt_message['datasets'], bt_message['dataset_type'])
+		return True
+
 	def payload_for_port_info(port, mode_info):
 		# 3.15.2
 		# mode_info:
@@ -26,6 +26,7 @@ class HubPortModeInfo():
 		self.motor_bias = None
 		self.capability_readable = None # FIXME
 		self.value_readable = None
+		self.value_format = None	# ( datasets, dataset_type ) from VALUE FORMAT
 
 	def dump_info(self):
 		retval = {}
@@ -50,6 +51,33 @@ class HubPortModeInfo():
 		retval['value_readable'] = self.value_readable
 		return retval
 
+	# Everything reported for the mode, for PortInfoCache
+	def cache_info(self):
+		retval = self.dump_info()
+		retval['motor_bias'] = self.motor_bias
+		retval['value_format'] = list(self.value_format) if self.value_format else None
+		return retval
+
+	# Fill in the mode from cache_info() instead of probing it
+	def load_cache_info(self, info):
+		self.mode_direction = info['direction']
+		self.name = info['name']
+		self.raw_min = info['raw']['min']
+		self.raw_max = info['raw']['max']
+		self.pct_min = info['pct']['min']
+		self.pct_max = info['pct']['max']
+		self.si_min = info['si']['min']
+		self.si_max = info['si']['max']
+		self.symbol = info['symbol']
+		self.mapping = dict(info['mapping'])
+		self.motor_bias = info['motor_bias']
+		self.capability_readable = info['capability_readable']
+		self.value_readable = info['value_readable']
+		if info['value_format']:
+			self.value_format = tuple(info['value_format'])
+		# Nothing left to ask
+		self.mode_requests = {}
+
 # 		def scan_mode(direction, port, mode):
 # 			if not mode in self.port_mode_info[port]:
 # 				self.port_mode_info[port][mode] = {
@@ -169,6 +197,7 @@ class HubPortModeInfo():
 			readable += ' with '+str(bt_message['total_figures'])+' total figures and '+str(bt_message['decimals'])+' decimals'
 
 			self.value_readable = readable
+			self.value_format = (bt_message['datasets'], bt_message['dataset_type'])
 		else:
 			readable = f"IDK_DEVICE port {self.port}, mode {self.mode_number}: INFO TYPE: {hex(mode_info_hexkey)}"
 			decoded = False
@@ -10,3 +10,4 @@ class HubPortReported():
 		self.mode_count = 0
 		self.mode_combinations = None
 		self.virtual_port_capable = False
+		self.mode_combinations_requested = False	# Port said it was logic_combineable
@@ -35,6 +35,9 @@ class Force(LPF_Device):
 		if not self.outstanding_requests.empty():
 			mode = self.outstanding_requests.get()
 
+		return self.decode_mode_value(port, mode, data)
+
+	def decode_mode_value(self, port, mode, data):
 		if mode == 0:
 			if len(data) == 1:
 				return ('force','percentage', int.from_bytes(data, byteorder="little") )
@@ -51,7 +51,7 @@ class LED(LPF_Device):
 				power
 			])
 			payload[0] = len(payload)
-			gatt_payload_writer(payload, 'port_writes')
+			gatt_payload_writer(payload, 'port_writes', (self.port, mode, 0x51))
 			return True
 
 		return False
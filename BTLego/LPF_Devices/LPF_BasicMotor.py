@@ -13,18 +13,29 @@ class LPF_BasicMotor(LPF_Device):
 			# mode_number: [ delta_interval, subscribe_boolean, Mode Information Name (Section 3.20.1), tuple of generated messages when subscribed to this mode ]
 			0: [ self.delta_interval, False, 'POWER', ()],
 		}
+		self.set_mode_value_format(0, 1, '8bit')
 
 	def decode_pvs(self, port, data):
 		# FIXME: You're gonna want to set the deltas for POS and APOS...
 
 		# Mode 0 or 1
-		if len(data) == 1:
+		value_struct = self.mode_value_structs[0]
+		if len(data) == value_struct.size:
 			# Negative is face-on counterclockwise
-			speed_or_power = int.from_bytes(data[0:2], byteorder="little", signed=True)
+			speed_or_power, = value_struct.unpack_from(data)
 			return ('motor_speed','speed',speed_or_power )
 
 		return super().decode_pvs(port, data)
 
+	def decode_mode_value(self, port, mode, data):
+		# Mode 0 or 1
+		if mode == 0 or mode == 1:
+			value_struct = self.mode_value_structs.get(mode)
+			if value_struct and len(data) == value_struct.size:
+				speed_or_power, = value_struct.unpack_from(data)
+				return ('motor_speed','speed',speed_or_power )
+		return None
+
 	def send_message(self, message, gatt_payload_writer):
 		'''
 		Message tuple:
@@ -71,6 +82,6 @@ class LPF_BasicMotor(LPF_Device):
 
 		if payload:
 			# self.select_mode_if_not_selected(mode, gatt_payload_writer)
-			gatt_payload_writer(payload, 'port_writes')
+			gatt_payload_writer(payload, 'port_writes', (self.port, mode, 0x51))
 			return True
 		return False
@@ -1,62 +1,80 @@
 from enum import IntEnum
 from queue import SimpleQueue
+import struct
+import logging
 
 from ..Decoder import Decoder
 
-import importlib
-from os.path import dirname, basename, isfile, join
-import glob
 
 class Devtype(IntEnum):
 #	PROPERTY = 0
 	FIXED = 1
 	LPF = 2
 
+# Every message type an LPF2 device class can emit, so hubs can validate
+# subscription requests without importing every device class to ask it.
+# Update this when adding a device or mode: scan_lpf_message_types() works it
+# out from the classes themselves
+lpf_message_types = (
+	'alt_event', 'ambient_light', 'angle', 'boost_accel', 'boost_impact',
+	'boost_orientation', 'boost_rollpitch', 'boost_tilt', 'color',
+	'controller_buttons', 'controller_keysdown', 'distance_long',
+	'distance_short', 'duplotrain_color', 'duplotrain_reflectivity',
+	'duplotrain_rgb', 'duplotrain_speed', 'duplotrain_tag', 'event', 'force',
+	'force_raw', 'gesture', 'idk_', 'light', 'motion', 'motion_count',
+	'motion_detect', 'motor_apos', 'motor_load', 'motor_pos', 'motor_speed',
+	'pants', 'peak', 'peak_raw', 'playvm_tilt', 'puh_acceleration',
+	'puh_crashes', 'puh_rotational_acc', 'puh_rotational_deg', 'reflectivity',
+	'rgb', 'rgb_i', 'rssi', 'scanner', 'tap', 'temp', 'touch', 'voltage'
+)
+
 def generate_valid_lpf_message_types():
 	"""
-	Iterate over all LPF2 devices and get their list of emitted messages types
-	that correspond to integer modes by calling message_types() on their instances.
+	All the message types LPF2 devices emit that correspond to integer modes
 
 	BLE_Device calls this so it can validate subscription requests
 	"""
-	modules = glob.glob(join(dirname('BTLego/LPF_Devices/'), "*.py"))
-	modules.sort()
-	class_objects = []
-	for i, f in list(enumerate(modules)):
-		b = basename(f)[:-3]
-		# If you let this thing import itself,
-		if isfile(f) and not f.endswith('__init__.py'):
-			lpf_classname = basename(f)[:-3]
-			if not lpf_classname.startswith('LPF_'):
-				# All intermediate subclasses need to start with LPF_ to avoid similar problems
-				lpf_class_module = importlib.import_module(f'BTLego.LPF_Devices.{lpf_classname}')
-				lpf_classobj = getattr(lpf_class_module, lpf_classname)
-				if issubclass(lpf_classobj, LPF_Device):
-					class_objects.append(lpf_classobj)
-				else:
-					modules.remove(f)	# Not a LPF_Device
-			else:
-				# Do not do this to yourself, LPF_Device, because accessing
-				# LPF_Device.message_types assigns generated_message_types to
-				# the not-None value of [] and then every subsequent class in
-				# this list will pick the not-None value up from its parent class (this one)
-				# and refuse to populate
-				#
-				# We can thank issubclass() for thinking a class is its own
-				# subclass for this now-fixed bug...
-				modules.remove(f)
-		else:
-			modules.remove(f)	# First order filter
+	return lpf_message_types
+
+def scan_lpf_message_types():
+	"""
+	Import and instantiate every LPF2 device class in the type id registry,
+	and collect their message_types.  Slow, for checking lpf_message_types
+	"""
+	from . import lpf_device_classnames, LPF_classobj_for_type_id
 
 	valid_message_types = set()
-	for lpf_classobj in class_objects:
-		theclass = lpf_classobj(-1)
-		#print(f'Generating {lpf_classobj.__name__}...')
-		lpf_message_types = theclass.message_types
-		#print(f'\t{lpf_message_types}')
-		if lpf_message_types:
-			for t in lpf_message_types: valid_message_types.add(t)
-	return list(valid_message_types)
+	for type_id in lpf_device_classnames:
+		theclass = LPF_classobj_for_type_id(type_id)(-1)
+		valid_message_types.update(theclass.message_types)
+	return tuple(sorted(valid_message_types))
+
+# struct format characters for the dataset types a mode reports in its VALUE_FORMAT
+# Signed by default, use the uppercase character for unsigned
+dataset_type_struct_formats = {
+	'8bit': 'b',
+	'16bit': 'h',
+	'32bit': 'i',
+	'FLOAT': 'f'	# 32 bit IEEE 754
+}
+
+# Compiled value layouts shared by every device instance, keyed by (datasets, dataset_type, signed)
+value_format_structs = {}
+
+def value_format_struct(datasets, dataset_type, signed=True):
+	"""
+	Return the precompiled struct.Struct that unpacks a mode's port value of
+	datasets number of little endian dataset_type values (Decoder VALUE_FORMAT names)
+	"""
+	value_format = (datasets, dataset_type, signed)
+	compiled_struct = value_format_structs.get(value_format)
+	if compiled_struct is None:
+		format_char = dataset_type_struct_formats[dataset_type]
+		if not signed and dataset_type != 'FLOAT':
+			format_char = format_char.upper()
+		compiled_struct = struct.Struct('<'+format_char*datasets)
+		value_format_structs[value_format] = compiled_struct
+	return compiled_struct
 
 class LPF_Device():
 
@@ -110,6 +128,94 @@ class LPF_Device():
 			# mode_number: [ delta_interval, subscribe_boolean, Mode Information Name (Section 3.20.1), tuple of generated messages when subscribed to this mode ]
 		}
 
+		# Layout of the port value for modes in mode_subs, see set_mode_value_format()
+		self.mode_value_formats = {
+			# mode_number: ( datasets, dataset_type, signed )
+		}
+		self.mode_value_structs = {
+			# mode_number: struct.Struct for unpack_from() in decode_pvs
+		}
+
+		# Modes the port can report together, from the HubPort's port information
+		# None until the port has been asked, see set_mode_combinations()
+		self.mode_combinations = None
+		self._mode_combinations_requested = False
+
+		# Mode/DataSet entries of the running combined mode setup, in the order
+		# of the bits in the 0x46 pointer, see PIF_combined_setup()
+		self.combi_layout = None
+
+	def set_mode_value_format(self, mode, datasets, dataset_type, signed=None):
+		"""
+		Declare the layout of the port value data sent by the mode: the number
+		of datasets and their dataset_type ('8bit', '16bit', '32bit' or 'FLOAT'
+		like the VALUE_FORMAT mode information) and whether they are signed.
+
+		Subclasses declare this for the modes they decode in __init__, after
+		adding the mode to mode_subs.  The BLE_Device updates it with the
+		VALUE_FORMAT reported by the port mode information, which does not say
+		if the values are signed, so signed=None keeps what was declared.
+
+		decode_pvs then unpacks the mode's value with a single
+		self.mode_value_structs[mode].unpack_from(data)
+		"""
+		if not mode in self.mode_subs:
+			return False
+		if not dataset_type in dataset_type_struct_formats or datasets < 1:
+			return False
+
+		if signed is None:
+			signed = True
+			if mode in self.mode_value_formats:
+				signed = self.mode_value_formats[mode][2]
+
+		self.mode_value_formats[mode] = (datasets, dataset_type, signed)
+		self.mode_value_structs[mode] = value_format_struct(datasets, dataset_type, signed)
+		return True
+
+	def port_info_state(self):
+		"""
+		Everything set_mode_value_format() and set_mode_combinations() change,
+		so the HubPort can put it back with restore_port_info_state() if it
+		fails partway through loading cached port info
+		"""
+		return (dict(self.mode_value_formats), dict(self.mode_value_structs), self.mode_combinations, self._mode_combinations_requested)
+
+	def restore_port_info_state(self, state):
+		self.mode_value_formats, self.mode_value_structs, self.mode_combinations, self._mode_combinations_requested = state
+
+	def set_mode_combinations(self, mode_combinations, gatt_payload_writer):
+		"""
+		The HubPort calls this with the mode combinations the port reported
+		(LWP 3.15.2) as { combination_index: (modes,) }
+
+		If more than one mode was subscribed while waiting for these, switch
+		to a combined mode setup now
+		"""
+		if mode_combinations:
+			self.mode_combinations = mode_combinations
+		else:
+			self.mode_combinations = {}
+
+		if self._mode_combinations_requested and not self.combi_layout:
+			subscribed_modes = [mode_int for mode_int in self.mode_subs if self.mode_subs[mode_int][1]]
+			if len(subscribed_modes) > 1:
+				return self.PIF_combined_setup(subscribed_modes, gatt_payload_writer)
+		return False
+
+	def combination_index_for_modes(self, modes):
+		"""
+		Return the index of the first reported mode combination containing all
+		of modes, or None if the port can't report them together
+		"""
+		if not self.mode_combinations:
+			return None
+		wanted = set(modes)
+		for combi_index in sorted(self.mode_combinations):
+			if wanted.issubset(self.mode_combinations[combi_index]):
+				return combi_index
+		return None
+
 	def set_protocol(self, payload_mode):
 		if payload_mode.lower() == 'lwp3':
 			self.payload_mode = 'LWP3'
@@ -123,10 +229,11 @@ class LPF_Device():
 		return it as a tuple
 		"""
 
-		lpf_class_module = importlib.import_module(f'BTLego.LPF_Devices.{self.__class__.__name__}')
-		lpf_classobj = getattr(lpf_class_module, self.__class__.__name__)
+		lpf_classobj = self.__class__
 
-		if lpf_classobj.generated_message_types is None:
+		# Not inherited: a parent class (LPF_Device itself, for unknown devices)
+		# may have generated its own before this class was even imported
+		if lpf_classobj.__dict__.get('generated_message_types') is None:
 			generated_array = []
 			for mode,config in self.mode_subs.items():
 				if config[3]:
@@ -160,6 +267,10 @@ class LPF_Device():
 		A BLE_device instance should call this after receiving data generated by
 		the device this class instance represents
 
+		data can be a memoryview into the notification buffer (see
+		BLE_Device.zero_copy_decode), so convert anything returned to int, str,
+		etc.  Never return a slice of data.
+
 		Return (type, key, value) suitable for client processing
 
 		This stub just dumps the data out and indicates a subclass should override
@@ -168,6 +279,53 @@ class LPF_Device():
 		print(f'{self.name} PORT {port} LPF_DATA: '+' '.join(hex(n) for n in data))
 		return None
 
+	def decode_mode_value(self, port, mode, data):
+		"""
+		Decode the value of a single mode out of a Port Value - Combined
+
+		decode_pvs can't be used for this, because most of them work out the
+		mode from the subscriptions, _selected_mode or the length of data, and
+		in combined mode every mode is reporting.  Subclasses that can decode a
+		value knowing only its mode override this, and only those ever get set
+		up in combined mode (see PIF_combined_setup)
+
+		Return (type, key, value), the same as decode_pvs would for the mode
+		"""
+		return None
+
+	def decodes_mode_values(self):
+		return type(self).decode_mode_value is not LPF_Device.decode_mode_value
+
+	def decode_pvc(self, port, pointer, data):
+		"""
+		Decode Port Value - Combined
+		LWP 3.22
+		The pointer has a bit set for each Mode/DataSet entry of the combined
+		mode setup (see combi_layout) that has a value in data, in that order.
+
+		Every mode that got all of its datasets is passed to decode_mode_value()
+		so it comes out as the same message type it would be if it were
+		subscribed on its own.
+
+		Return a list of (type, key, value) suitable for client processing
+		"""
+		messages = []
+		if port != self.port or not self.combi_layout:
+			return messages
+
+		entry = 0
+		offset = 0
+		for mode, datasets, dataset_size in self.combi_layout:
+			mode_bits = ((1 << datasets) - 1) << entry
+			present = bin(pointer & mode_bits).count('1')
+			length = present * dataset_size
+			# Can't do anything with a partial update of a mode
+			if present == datasets and offset + length <= len(data):
+				messages.append(self.decode_mode_value(port, mode, data[offset:offset+length]))
+			offset += length
+			entry += datasets
+		return messages
+
 	def get_port_info(self, mode, gatt_payload_writer):
 		"""
 		This function does a (negative) select on the provided mode
@@ -203,17 +361,71 @@ class LPF_Device():
 
 		These correspond to modes in the device's mode_subs dictionary
 		"""
-		if self.generated_message_types:
-			if message_type in self.generated_message_types:
+		if self.message_types:
+			if message_type in self.message_types:
+				modes = [mode_int for mode_int in self.mode_subs if message_type in self.mode_subs[mode_int][3]]
+
+				# Every mode that should be reporting afterward
+				subscribed_modes = set(mode_int for mode_int in self.mode_subs if self.mode_subs[mode_int][1])
+				if should_subscribe:
+					subscribed_modes.update(modes)
+				else:
+					subscribed_modes.difference_update(modes)
+
+				if self.combined_subscription(sorted(subscribed_modes), gatt_payload_writer):
+					return True
+
 				subbed_anything = False
-				for mode_int in self.mode_subs:
-					if message_type in self.mode_subs[mode_int][3]:
-						sub_result = self.PIF_single_setup(mode_int, should_subscribe, gatt_payload_writer)
-						if not subbed_anything:
-							subbed_anything = sub_result
+				for mode_int in modes:
+					sub_result = self.PIF_single_setup(mode_int, should_subscribe, gatt_payload_writer)
+					if not subbed_anything:
+						subbed_anything = sub_result
 				return subbed_anything
 		return False
 
+	def combined_subscription(self, modes, gatt_payload_writer):
+		"""
+		A single mode setup only lets one mode report at a time, so when more
+		than one of modes should be reporting, set up a combination of them if
+		the port has one.  If it's not known yet, the port is asked and
+		set_mode_combinations() finishes the job.
+
+		Returns False if the caller should fall back to the single mode setup
+		"""
+		if self.payload_mode != 'LWP3':
+			return False
+
+		if len(modes) > 1:
+			if self.mode_combinations is None:
+				if not self._mode_combinations_requested:
+					self._mode_combinations_requested = True
+					payload = bytearray([
+						0x5,	# len
+						0x0,	# padding
+						0x21,	# Command: port_info_req
+						# end header
+						self.port,
+						0x2		# Information Type: Possible mode combinations
+					])
+					payload[0] = len(payload)
+					gatt_payload_writer(payload, 'port_config')
+				return False
+			if self.PIF_combined_setup(modes, gatt_payload_writer):
+				return True
+			if self.combi_layout:
+				# The old combination would keep reporting over the single mode setup
+				logging.getLogger(__name__.split('.')[0]).warning(f'{self.name} on port {self.port} can\'t report modes {modes} at once, falling back to one mode at a time')
+				self.PIF_combined_reset(gatt_payload_writer)
+			return False
+
+		if self.combi_layout:
+			# Back down to one mode (or none)
+			self.PIF_combined_reset(gatt_payload_writer)
+			for mode in modes:
+				self.PIF_single_setup(mode, True, gatt_payload_writer)
+			return True
+		return False
+
 	def set_mode_delta(self, mode, delta_interval):
 		"""
 		Set the numerical limit of change in the value of the specified mode that
@@ -316,6 +528,96 @@ class LPF_Device():
 		return gatt_payload_writer(payload, 'port_config')
 
 
+	def PIF_combined_payload(self, subcommand, parameters=()):
+		payload = bytearray([
+			0x5,		# length
+			0x00,
+			0x42,		# Port input format setup (combined)
+			self.port,
+			subcommand
+		])
+		payload.extend(parameters)
+		payload[0] = len(payload)
+		return payload
+
+	def PIF_combined_setup(self, modes, gatt_payload_writer):
+		"""
+		Port Input Format (PIF) Setup for a combination of modes
+		LWP Section 3.18
+
+		Every dataset of every mode in modes is set up as a Mode/DataSet entry
+		so all of the modes report together in Port Value - Combined messages,
+		decoded by decode_pvc()
+
+		Requires the modes to be in one of the port's mode_combinations and to
+		have a declared value format (set_mode_value_format) so the combined
+		values can be split back up
+		"""
+		if self.payload_mode != 'LWP3':
+			return False
+
+		# Couldn't make any sense of what comes back
+		if not self.decodes_mode_values():
+			return False
+
+		modes = sorted(modes)
+		combi_index = self.combination_index_for_modes(modes)
+		if combi_index is None:
+			return False
+
+		layout = []
+		mode_datasets = []
+		for mode in modes:
+			if not mode in self.mode_subs or not mode in self.mode_value_formats:
+				return False
+			datasets, dataset_type, signed = self.mode_value_formats[mode]
+			layout.append((mode, datasets, value_format_struct(1, dataset_type, signed).size))
+			for dataset in range(datasets):
+				# Upper nibble mode, lower nibble dataset
+				mode_datasets.append((mode << 4) | dataset)
+
+		# LWP lists eight Mode/DataSet entries at most
+		if len(mode_datasets) > 8:
+			return False
+
+		# Lock the device while changing the setup
+		gatt_payload_writer(self.PIF_combined_payload(0x2), 'port_config')
+
+		if self.combi_layout:
+			# Shut off anything in the old setup that isn't in the new one
+			for old_mode, _, _ in self.combi_layout:
+				if not old_mode in modes:
+					self.PIF_single_setup(old_mode, False, gatt_payload_writer)
+
+		for mode in modes:
+			self.PIF_single_setup(mode, True, gatt_payload_writer)
+
+		# Set ModeAndDataSet combination
+		combination = bytearray([combi_index])
+		combination.extend(mode_datasets)
+		gatt_payload_writer(self.PIF_combined_payload(0x1, combination), 'port_config')
+
+		self.combi_layout = tuple(layout)
+
+		# UnlockAndStartWithMultiUpdateEnabled
+		return gatt_payload_writer(self.PIF_combined_payload(0x3), 'port_config')
+
+	def PIF_combined_reset(self, gatt_payload_writer):
+		"""
+		Turn off notifications for every mode in the combined mode setup and
+		unlock the device without multi-update
+		"""
+		if not self.combi_layout:
+			return False
+
+		gatt_payload_writer(self.PIF_combined_payload(0x2), 'port_config')
+		for mode, _, _ in self.combi_layout:
+			self.PIF_single_setup(mode, False, gatt_payload_writer)
+		self.combi_layout = None
+
+		# UnlockAndStartWithMultiUpdateDisabled
+		return gatt_payload_writer(self.PIF_combined_payload(0x4), 'port_config')
+
 	def select_mode_if_not_selected(self, mode, gatt_payload_writer):
 		'''
 		This does the "negative subscribe" to select the device's mode,
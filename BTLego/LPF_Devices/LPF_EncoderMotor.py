@@ -15,14 +15,27 @@ class LPF_EncoderMotor(LPF_BasicMotor):
 		# mode_number: [ delta_interval, subscribe_boolean, Mode Information Name (Section 3.20.1), tuple of generated messages when subscribed to this mode ]
 		self.mode_subs[1] = [ self.delta_interval, False, 'SPEED', ('motor_speed',)];
 		self.mode_subs[2] = [ self.delta_interval, False, 'POS', ('motor_pos',)]
+		self.set_mode_value_format(1, 1, '8bit')
+		self.set_mode_value_format(2, 1, '32bit', False)
 
 	def decode_pvs(self, port, data):
 		# FIXME: You're gonna want to set the deltas for POS and APOS...
 
 		# Mode 2
-		if len(data) == 4:
+		value_struct = self.mode_value_structs[2]
+		if len(data) == value_struct.size:
 			# 0 to 4294967295 (MAX_INT_32) wraps around
-			pos = int.from_bytes(data[0:4], byteorder="little")
+			pos, = value_struct.unpack_from(data)
 			return ('motor_pos','pos',pos )
 
 		return super().decode_pvs(port, data)
+
+	def decode_mode_value(self, port, mode, data):
+		if mode == 2:
+			value_struct = self.mode_value_structs[2]
+			if len(data) == value_struct.size:
+				pos, = value_struct.unpack_from(data)
+				return ('motor_pos','pos',pos )
+			return None
+
+		return super().decode_mode_value(port, mode, data)
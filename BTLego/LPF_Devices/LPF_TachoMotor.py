@@ -8,18 +8,30 @@ class LPF_TachoMotor(LPF_EncoderMotor):
 		super().__init__(port)
 
 		self.mode_subs[3] = [ self.delta_interval, False, 'APOS', ('motor_apos',)]
+		self.set_mode_value_format(3, 1, '16bit')
 
 	def decode_pvs(self, port, data):
 		# FIXME: You're gonna want to set the deltas for POS and APOS...
 
 		# Mode 3
-		if len(data) == 2:
+		value_struct = self.mode_value_structs[3]
+		if len(data) == value_struct.size:
 			# -180 to 179
-			apos = int.from_bytes(data[0:2], byteorder="little", signed=True)
+			apos, = value_struct.unpack_from(data)
 			return ('motor_apos','apos',apos )
 
 		return super().decode_pvs(port, data)
 
+	def decode_mode_value(self, port, mode, data):
+		if mode == 3:
+			value_struct = self.mode_value_structs[3]
+			if len(data) == value_struct.size:
+				apos, = value_struct.unpack_from(data)
+				return ('motor_apos','apos',apos )
+			return None
+
+		return super().decode_mode_value(port, mode, data)
+
 	def send_message(self, message, gatt_payload_writer):
 		'''
 		Message tuple:
@@ -198,7 +198,8 @@ class Matrix(LPF_Device):
 
 		if payload:
 			self.select_mode_if_not_selected(mode, gatt_payload_writer)
-			gatt_payload_writer(payload, 'port_writes')
+			# set_pixel sends the whole matrix too, so it can replace set_pixels
+			gatt_payload_writer(payload, 'port_writes', (self.port, mode, 0x51))
 			return True
 
 		return False
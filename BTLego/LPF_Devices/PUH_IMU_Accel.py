@@ -22,13 +22,15 @@ class PUH_IMU_Accel(LPF_Device):
 			0: [ self.delta_interval, False, 'GRV', ('puh_acceleration',) ],
 			1: [ self.delta_interval, False, 'CAL', ()]
 		}
+		self.set_mode_value_format(0, 3, '16bit')
 
 	def decode_pvs(self, port, data):
 		if port != self.port:
 			print('Bad port')
 			return None
 
-		if len(data) == 6:
+		value_struct = self.mode_value_structs[0]
+		if len(data) == value_struct.size:
 
 			# Port reports unit as "mG"
 			# milli... 9.8m/s^2? 32ft/s^2? Galileo?
@@ -41,11 +43,8 @@ class PUH_IMU_Accel(LPF_Device):
 			# three: Axis is the line perpendicular to the plane of the case split
 			#	~4140 when battery pack flat on table (-4110 upside down)
 
-			one = int.from_bytes(data[0:2], byteorder="little", signed=True)
-			two = int.from_bytes(data[2:4], byteorder="little", signed=True)
-			three = int.from_bytes(data[4:], byteorder="little", signed=True)
-
-			return ('imu', 'accel', (one, two, three) )
+			# ( one, two, three )
+			return ('imu', 'accel', value_struct.unpack_from(data) )
 
 		else:
 			print('UNKNOWN IMU ACCEL DATA '+' '.join(hex(n) for n in data))
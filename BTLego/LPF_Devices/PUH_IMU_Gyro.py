@@ -19,6 +19,7 @@ class PUH_IMU_Gyro(LPF_Device):
 			# mode_number: [ delta_interval, subscribe_boolean, Mode Information Name (Section 3.20.1), tuple of generated messages when subscribed to this mode ]
 			0: [ self.delta_interval, False, 'ROT', ('puh_rotational_acc',)],
 		}
+		self.set_mode_value_format(0, 3, '16bit')
 
 		self.zero_values = None
 		self.next_value_zero = False
@@ -42,10 +43,9 @@ class PUH_IMU_Gyro(LPF_Device):
 			print('Bad port')
 			return None
 
-		if len(data) == 6:
-			one = int.from_bytes(data[0:2], byteorder="little", signed=True)
-			two = int.from_bytes(data[2:4], byteorder="little", signed=True)
-			three = int.from_bytes(data[4:], byteorder="little", signed=True)
+		value_struct = self.mode_value_structs[0]
+		if len(data) == value_struct.size:
+			one, two, three = value_struct.unpack_from(data)
 
 			if self.next_value_zero:
 				self.next_value_zero = False
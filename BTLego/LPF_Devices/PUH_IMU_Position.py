@@ -23,6 +23,8 @@ class PUH_IMU_Position(LPF_Device):
 			1: [ self.delta_interval, False, 'IMP', ('puh_crashes',)],	# Impact?
 			2: [ self.delta_interval, False, 'CFG', ()]
 		}
+		self.set_mode_value_format(0, 3, '16bit')
+		self.set_mode_value_format(1, 1, '32bit', False)
 
 	# Decode Port Value - Single
 	# Return (type, key, value)
@@ -32,14 +34,21 @@ class PUH_IMU_Position(LPF_Device):
 			return None
 
 		if self.mode_subs[0][1]:
+			return self.decode_mode_value(port, 0, data)
+		elif self.mode_subs[1][1]:
+			return self.decode_mode_value(port, 1, data)
+		else:
+			print('UNKNOWN IMU POSITIONAL DEVICE DATA '+' '.join(hex(n) for n in data))
 
-			if len(data) != 6:
+	def decode_mode_value(self, port, mode, data):
+		if mode == 0:
+
+			value_struct = self.mode_value_structs[0]
+			if len(data) != value_struct.size:
 				print('UNKNOWN IMU POSITIONAL DEGREE MODE 0 DATA '+' '.join(hex(n) for n in data))
 				return None
 
-			one = int.from_bytes(data[0:2], byteorder="little", signed=True)
-			two = int.from_bytes(data[2:4], byteorder="little", signed=True)
-			three = int.from_bytes(data[4:], byteorder="little", signed=True)
+			yaw_pitch_roll = value_struct.unpack_from(data)
 
 			# one: Yaw in degrees.  Clockwise 0 to -179.  Counterclockwise 0 to 179.  Zeroed from power-on??
 				# Uh, ok, if the brick is pointed with the LED "up" when it's powered on,
@@ -47,14 +56,15 @@ class PUH_IMU_Position(LPF_Device):
 			# two: Pitch.  Positive pointing down.  Pitch down 0 to 90.  Pitch up 0 to -90
 			# three: Roll. Roll right 0 to 179.  Roll left 0 to -179
 
-			return ('puh_rotational_deg', 'yaw_pitch_roll', ( one, two, three) )
+			return ('puh_rotational_deg', 'yaw_pitch_roll', yaw_pitch_roll )
 
-		elif self.mode_subs[1][1]:
-			if len(data) != 4:
+		elif mode == 1:
+			value_struct = self.mode_value_structs[1]
+			if len(data) != value_struct.size:
 				print('UNKNOWN IMU CRASH MODE 1 DATA '+' '.join(hex(n) for n in data))
 				return None
 
-			crashes = int.from_bytes(data, byteorder="little", signed=False)
+			crashes, = value_struct.unpack_from(data)
 
 			return ('puh_crashes', 'impact_count', crashes )
 
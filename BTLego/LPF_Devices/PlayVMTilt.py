@@ -19,19 +19,18 @@ class PlayVMTilt(LPF_Device):
 			# mode_number: [ delta_interval, subscribe_boolean, Mode Information Name (Section 3.20.1), tuple of generated messages when subscribed to this mode ]
 			0: [ self.delta_interval, False, 'ORINT', ('playvm_tilt',)],
 		}
+		self.set_mode_value_format(0, 4, '16bit')
 
 	def decode_pvs(self, port, data):
 
 		# Mode 0
 		# "symbol": "QUA",
-		if len(data) == 8:
+		value_struct = self.mode_value_structs[0]
+		if len(data) == value_struct.size:
 			# -1000 to 1000
-			one = int.from_bytes(data[0:2], byteorder="little", signed=True)
-			two = int.from_bytes(data[2:4], byteorder="little", signed=True)
-			three = int.from_bytes(data[4:6], byteorder="little", signed=True)
-			four = int.from_bytes(data[6:8], byteorder="little", signed=True)
 			# FIXME: quad being a temporary name, don't know what these numbers are
-			return ('playvm_tilt','quad', (one, two, three, four) )
+			# ( one, two, three, four )
+			return ('playvm_tilt','quad', value_struct.unpack_from(data) )
 
 			# Numbers do not wrap, they just go back down (weird)
 			# Moving the Hub in a geometric translation does mostly nothing
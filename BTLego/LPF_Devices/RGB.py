@@ -63,7 +63,7 @@ class RGB(LPF_Device):
 
 		if payload:
 			self.select_mode_if_not_selected(mode, gatt_payload_writer)
-			gatt_payload_writer(payload, 'port_writes')
+			gatt_payload_writer(payload, 'port_writes', (self.port, mode, 0x51))
 			return True
 		return False
 
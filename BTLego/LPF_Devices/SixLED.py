@@ -68,7 +68,8 @@ class SixLED(LPF_Device):
 				led_power
 			])
 			payload[0] = len(payload)
-			gatt_payload_writer(payload, 'port_writes')
+			# Each LED is separate, so only replace writes to the same one
+			gatt_payload_writer(payload, 'port_writes', (self.port, mode, 0x51, led_bitselect))
 			return True
 
 		return False
@@ -29,6 +29,9 @@ class UltraDist(LPF_Device):
 			7: [ self.delta_interval, False, 'ADRAW', ()],
 			8: [ -1, False, 'CALIB', ()]	# NO IO
 		}
+		self.set_mode_value_format(0, 1, '16bit', False)
+		self.set_mode_value_format(1, 1, '16bit', False)
+		self.set_mode_value_format(4, 1, '32bit', False)
 
 	# When disconnected from the sensor with a T6 torx, the black housing does not register on the hub
 	# I guess you can talk directly to the LPF2 port over the 8-pin connector
@@ -44,12 +47,16 @@ class UltraDist(LPF_Device):
 		if not self.outstanding_requests.empty():
 			mode = self.outstanding_requests.get()
 
+		return self.decode_mode_value(port, mode, data)
+
+	def decode_mode_value(self, port, mode, data):
 		if mode == 0:
-			if len(data) == 2:
+			value_struct = self.mode_value_structs[0]
+			if len(data) == value_struct.size:
 				# Port info says "CM" and decimals is 1.  Why not just mm then?
 				# 5 figures covers 65535, which is "infinity".
 				# "Figures" must not cover decimals
-				distance = int.from_bytes(data, byteorder="little")
+				distance, = value_struct.unpack_from(data)
 				if distance == 65535:
 					# debatable if I should be doing this...
 					distance = -1
@@ -60,8 +67,9 @@ class UltraDist(LPF_Device):
 				return ('ultrasonic','distance_long', distance)
 
 		elif mode == 1:
-			if len(data) == 2:
-				distance = int.from_bytes(data, byteorder="little")
+			value_struct = self.mode_value_structs[1]
+			if len(data) == value_struct.size:
+				distance, = value_struct.unpack_from(data)
 				if distance == 65535:
 					# debatable if I should be doing this...
 					distance = -1
@@ -72,8 +80,9 @@ class UltraDist(LPF_Device):
 				return ('ultrasonic','distance_short', distance)
 
 		elif mode == 4:
-			if len(data) == 4:
-				wat_dis = int.from_bytes(data, byteorder="little")
+			value_struct = self.mode_value_structs[4]
+			if len(data) == value_struct.size:
+				wat_dis, = value_struct.unpack_from(data)
 				# First 27 bits set, so that's weird
 				# What are the upper five for?
 				if wat_dis == 134217727:
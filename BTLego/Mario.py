@@ -76,6 +76,9 @@ class Mario(BLE_LWP_Device):
 		# Seems to advertise none when initially connected
 		self.minimum_attached_ports = 6
 
+		# Already busy chattering about everything it scans, don't pile on
+		self.gatt_send_burst = 2
+
 		if self.shortname == 'mario':
 			self.part_identifier = "mar0007"
 		elif self.shortname == 'luigi':
@@ -158,7 +161,7 @@ class Mario(BLE_LWP_Device):
 				self.message_queue.put( ('info', 'unknown', f'Icon {hex(color)} color not found:{name[13]}') )
 				return
 
-			if self.logger.isEnabledFor(logging.DEBUG):
+			if self.log_debug:
 				color_str = Mario.app_icon_color_names[color]
 				icon_str = Mario.app_icon_names[icon]
 				self.message_queue.put( ('info', 'debug_icon', (color_str, icon_str )) )
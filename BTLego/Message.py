@@ -0,0 +1,117 @@
+from enum import IntEnum
+from typing import NamedTuple, Any
+
+# Every device (BLE_Device.message_types uses this)
+device_message_types = (
+	'event',
+	'info',
+	'error',
+	'device_ready',
+	'connection_request',
+	'property',
+)
+
+# Sent by devices but not subscribable on their own (yet?)
+unsubscribable_message_types = (
+	'imu',
+	'ultrasonic',
+	'boost',
+)
+
+# Integer ids for message types, named the same as the strings so
+# MessageType['motor_pos'] works.  Only add to the end of a group, callers may
+# have stored the numbers.  tests/test_message.py checks it covers the lists
+class MessageType(IntEnum):
+	# device_message_types
+	event = 0x1
+	info = 0x2
+	error = 0x3
+	device_ready = 0x4
+	connection_request = 0x5
+	property = 0x6
+
+	# lpf_message_types
+	alt_event = 0x20
+	ambient_light = 0x21
+	angle = 0x22
+	boost_accel = 0x23
+	boost_impact = 0x24
+	boost_orientation = 0x25
+	boost_rollpitch = 0x26
+	boost_tilt = 0x27
+	color = 0x28
+	controller_buttons = 0x29
+	controller_keysdown = 0x2a
+	distance_long = 0x2b
+	distance_short = 0x2c
+	duplotrain_color = 0x2d
+	duplotrain_reflectivity = 0x2e
+	duplotrain_rgb = 0x2f
+	duplotrain_speed = 0x30
+	duplotrain_tag = 0x31
+	force = 0x32
+	force_raw = 0x33
+	gesture = 0x34
+	light = 0x35
+	motion = 0x36
+	motion_count = 0x37
+	motion_detect = 0x38
+	motor_apos = 0x39
+	motor_load = 0x3a
+	motor_pos = 0x3b
+	motor_speed = 0x3c
+	pants = 0x3d
+	peak = 0x3e
+	peak_raw = 0x3f
+	playvm_tilt = 0x40
+	puh_acceleration = 0x41
+	puh_crashes = 0x42
+	puh_rotational_acc = 0x43
+	puh_rotational_deg = 0x44
+	reflectivity = 0x45
+	rgb = 0x46
+	rgb_i = 0x47
+	rssi = 0x48
+	scanner = 0x49
+	tap = 0x4a
+	temp = 0x4b
+	touch = 0x4c
+	voltage = 0x4d
+	idk_ = 0x4e
+
+	# unsubscribable_message_types
+	imu = 0x80
+	ultrasonic = 0x81
+	boost = 0x82
+
+# Lookup for type_id, since MessageType['unheard_of'] raises
+message_type_ids = { message_type.name: message_type for message_type in MessageType }
+
+# Names for the ( type, key, value ) 3-tuples devices put in the message_queue.
+# Devices send plain tuples, which are cheaper to build:
+# Message._make(message) to get the names and type_id
+class Message(NamedTuple):
+	type: str
+	key: Any
+	value: Any
+
+	@property
+	def type_id(self):
+		return message_type_ids.get(self.type)
+
+# What a callback gets is a plain ( callback_uuid, type, key, value ) tuple,
+# so delivery doesn't build anything extra per callback.
+# CallbackMessage._make(message) in the callback to get the names and type_id
+class CallbackMessage(NamedTuple):
+	callback_uuid: str
+	type: str
+	key: Any
+	value: Any
+
+	@property
+	def type_id(self):
+		return message_type_ids.get(self.type)
+
+# Decoders return this to say "decoded fine, but don't send anything"
+# Checked with "is", so always return this one
+NOOP = Message('noop', None, None)
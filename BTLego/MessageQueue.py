@@ -0,0 +1,130 @@
+import asyncio
+from collections import deque
+
+class MessageQueue():
+
+	# What put() does with a message when the queue is already max_depth deep
+	overflow_policies = (
+		'block',		# Take it anyway, and the device waits on wait_for_room() before decoding anything else
+		'drop_oldest',	# Throw out the oldest queued message of the same type to make room
+		'drop_newest'	# Throw out the message being put
+	)
+
+	def __init__(self, max_depth=1024, default_policy='block'):
+		"""
+		Messages ( type, key, value ) waiting to be delivered to callbacks by
+		BLE_Device._drain_messages()
+
+		Same put/get/empty/qsize as the SimpleQueue it replaced, since all the
+		message processing puts on it without awaiting.  Backpressure is the
+		device's job: it awaits wait_for_room() after each notification.
+
+		max_depth:
+			Messages allowed in the queue before the overflow policy of the
+			message type kicks in.  Zero for no limit
+		"""
+		self.max_depth = max_depth
+		self.default_policy = default_policy
+		self.policies = {
+			# message_type: overflow policy
+		}
+		self.dropped = {
+			# message_type: count
+		}
+
+		# Message types somebody only wants the newest of, set by the device.
+		# Messages of these types are counted per conflation key ( type, key, port )
+		# so the drain can tell if a newer one is already waiting behind it
+		self.conflated_types = set()
+		self._pending = {
+			# conflation_key: messages with that key in the queue
+		}
+
+		self._messages = deque()	# ( message, conflation_key or None )
+		self._not_empty = asyncio.Event()
+		self._room = asyncio.Event()
+		self._room.set()
+
+	def set_overflow_policy(self, message_type, policy):
+		if not policy in MessageQueue.overflow_policies:
+			return False
+		self.policies[message_type] = policy
+		return True
+
+	def put(self, message, port=None):
+		"""
+		port:
+			Port the message came from, for messages that don't say so themselves.
+			Two motors both send ('motor_pos','pos',...) and neither should
+			conflate the other away
+		"""
+		if self.max_depth and len(self._messages) >= self.max_depth:
+			policy = self.policies.get(message[0], self.default_policy)
+			if policy == 'drop_newest':
+				self._count_drop(message[0])
+				return False
+			elif policy == 'drop_oldest':
+				for index, (queued_message, conflation_key) in enumerate(self._messages):
+					if queued_message[0] == message[0]:
+						del self._messages[index]
+						self._uncount_pending(conflation_key)
+						self._count_drop(message[0])
+						break
+				# Nothing of this type to throw out, so it goes over like 'block'
+
+		conflation_key = None
+		if message[0] in self.conflated_types:
+			conflation_key = (message[0], message[1], port)
+			self._pending[conflation_key] = self._pending.get(conflation_key, 0) + 1
+		self._messages.append((message, conflation_key))
+		self._not_empty.set()
+		if self.max_depth and len(self._messages) > self.max_depth:
+			self._room.clear()
+		return True
+
+	def get(self):
+		return self.get_entry()[0]
+
+	# Returns ( message, conflation_key ) for checking superseded() on later
+	def get_entry(self):
+		message, conflation_key = self._messages.popleft()
+		self._uncount_pending(conflation_key)
+		if not self.max_depth or len(self._messages) <= self.max_depth:
+			self._room.set()
+		return (message, conflation_key)
+
+	# A newer message with the same conflation key is waiting in the queue
+	def superseded(self, conflation_key):
+		return conflation_key in self._pending
+
+	def _uncount_pending(self, conflation_key):
+		if conflation_key:
+			remaining = self._pending[conflation_key] - 1
+			if remaining:
+				self._pending[conflation_key] = remaining
+			else:
+				del self._pending[conflation_key]
+
+	def empty(self):
+		return not self._messages
+
+	def qsize(self):
+		return len(self._messages)
+
+	async def wait_for_messages(self):
+		while not self._messages:
+			self._not_empty.clear()
+			await self._not_empty.wait()
+
+	async def wait_for_room(self):
+		await self._room.wait()
+
+	def _count_drop(self, message_type):
+		self.dropped[message_type] = self.dropped.get(message_type, 0) + 1
+
+	def stats(self):
+		return {
+			'depth': len(self._messages),
+			'max_depth': self.max_depth,
+			'dropped': dict(self.dropped)
+		}
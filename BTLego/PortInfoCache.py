@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+class PortInfoCache():
+
+	default_cachefile = "~/.cache/BTLego/port_info.json"
+
+	def __init__(self, cachefile=default_cachefile):
+		"""
+		What interrogate_ports() found out about each attached device, saved to
+		cachefile as JSON so it doesn't have to ask again.
+
+		The port and mode information a device reports doesn't change unless
+		its firmware does, so entries are keyed by
+		( hub class, io_type_id, hw version, fw version )
+		and the values are whatever HubPort.cache_info() returns.
+
+		Loaded the first time it's used.  A cachefile that can't be read is
+		treated as empty, and one that can't be written just isn't
+		"""
+		self.logger = logging.getLogger(__name__.split('.')[0])
+
+		self.cachefile = Path(os.path.expanduser(cachefile))
+		self.entries = None		# { key string: port info }
+
+		# Counters for dump_status
+		self.hits = 0
+		self.misses = 0
+
+	def key(hub_class_name, io_type_id, hw_ver_str, fw_ver_str):
+		# JSON object keys have to be strings
+		return f'{hub_class_name}/{io_type_id}/{hw_ver_str}/{fw_ver_str}'
+
+	def _load(self):
+		self.entries = {}
+		if not self.cachefile.is_file():
+			return
+		try:
+			with open(self.cachefile, "r") as f:
+				entries = json.loads(f.read())
+			if isinstance(entries, dict):
+				self.entries = entries
+			else:
+				self.logger.warning(f'Ignoring port info cache {self.cachefile}: not a JSON object')
+		except (OSError, ValueError) as e:
+			self.logger.warning(f'Ignoring port info cache {self.cachefile}: {e}')
+
+	def get(self, key):
+		if self.entries is None:
+			self._load()
+		info = self.entries.get(key)
+		if info is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+		return info
+
+	# Returns True if that changed anything that needs to be saved
+	def put(self, key, info):
+		if self.entries is None:
+			self._load()
+		if self.entries.get(key) == info:
+			return False
+		self.entries[key] = info
+		return True
+
+	def save(self):
+		if self.entries is None:
+			return False
+		try:
+			self.cachefile.parent.mkdir(parents=True, exist_ok=True)
+			# Write it out next to the old one and swap, so a crash doesn't leave half a file
+			tmpfile = self.cachefile.with_name(self.cachefile.name+'.tmp')
+			with open(tmpfile, "w") as f:
+				f.write(json.dumps(self.entries, indent=1))
+			os.replace(tmpfile, self.cachefile)
+		except OSError as e:
+			self.logger.warning(f'Unable to save port info cache {self.cachefile}: {e}')
+			return False
+		return True
+
+	def clear(self):
+		self.entries = {}
+		return self.save()
+
+	def stats(self):
+		return {
+			'cachefile': str(self.cachefile),
+			'entries': len(self.entries) if self.entries is not None else None,
+			'hits': self.hits,
+			'misses': self.misses
+		}
@@ -1,26 +1,52 @@
 import logging
 import sys
 import time
+import types
 import asyncio
-from bleak import BleakScanner, BleakClient
+from collections import deque
 
-from .Controller import Controller
-from .Mario import Mario
 from .Decoder import Decoder
-from .DuploTrain import DuploTrain
-from .Hub2 import Hub2
-from .Jajur1 import Jajur1
-from .BLE_WeDo import BLE_WeDo
+from .Message import MessageType, Message, CallbackMessage
+from .PortInfoCache import PortInfoCache
 
-from queue import SimpleQueue
+# Loaded the first time they're looked up (see __getattr__) so anything that
+# only needs the Decoder or MarioScanspace doesn't pay for Bleak and every hub
+__device_classnames__ = ('Controller', 'Mario', 'DuploTrain', 'Hub2', 'Jajur1', 'BLE_WeDo')
 
 __lego_devices__ = {}
 __callbacks_to_device_addresses__ = {}
 __callback_matcher__ = []
-__off_bleak_callback_queue__ = SimpleQueue()
+__off_bleak_callback_queue__ = None		# asyncio.Queue, only exists while the drain is running
+__off_bleak_callback_loop__ = None
+__early_off_bleak_callbacks__ = []		# Queued while the drain isn't running
+__off_bleak_callback_lanes__ = {}		# key: deque of ( coroutine, wait coroutine ) waiting their turn in that lane
+__off_bleak_callback_lane_tasks__ = set()
+__off_bleak_callback_concurrency__ = 4	# How many lanes can be awaiting at once
+__off_bleak_callback_limit__ = None		# asyncio.Semaphore of the above, made with the queue
 __running__ = False
 __overly_chatty_bluetooth__ = False
 
+def __getattr__(name):
+	if name in __device_classnames__:
+		return Decoder.class_obj_from_classname(name)
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class __BTLegoPackage(types.ModuleType):
+	# Importing a hub submodule (import BTLego.Hub2, from BTLego.Mario import
+	# Mario, or the __getattr__ above) sets BTLego.<classname> to the module,
+	# since they have the same name.  It's always been the class
+	#
+	# The import system does that with setattr() on this module after the
+	# submodule loads, and the module __getattr__ only runs for names that
+	# aren't set, so the only place to catch it is the module's own class.
+	# tests/test_imports.py checks every way of importing a hub
+	def __setattr__(self, name, value):
+		if name in __device_classnames__ and isinstance(value, types.ModuleType):
+			value = getattr(value, name, value)
+		super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = __BTLegoPackage
+
 def setLoggingLevel(level):
 	logger = logging.getLogger(__name__)
 	logger.setLevel(level)
@@ -28,6 +54,10 @@ def setLoggingLevel(level):
 	if not logger.hasHandlers():
 		logger.addHandler(logging.StreamHandler(sys.stdout))
 
+	# They cache whether to bother with debug logging
+	for device in __lego_devices__.values():
+		device.refresh_log_level()
+
 def set_callbacks(callback_matcher):
 	global __callback_matcher__
 
@@ -47,10 +77,52 @@ def set_callbacks(callback_matcher):
 				# [ 'event', 'device_ready', 'scanner' ]
 				pass
 
+def set_off_bleak_callback_concurrency(limit):
+	"""
+	How many of the lanes queued with await_function_off_bleak_callback() can
+	run at the same time.  Takes effect the next time async_run() starts
+	"""
+	global __off_bleak_callback_concurrency__
+	if limit < 1:
+		return False
+	__off_bleak_callback_concurrency__ = limit
+	return True
+
+def enable_port_info_cache(cachefile=PortInfoCache.default_cachefile):
+	"""
+	Save the port and mode information interrogate_ports() gets from each
+	attached device to cachefile, and use it instead of asking again the next
+	time the same device (and firmware) attaches to the same kind of hub.
+
+	Off by default.  Applies to devices already created and ones created later
+	"""
+	from .BLE_LWP_Device import BLE_LWP_Device
+	__set_port_info_cache(BLE_LWP_Device, PortInfoCache(cachefile))
+
+def disable_port_info_cache():
+	"""
+	Go back to probing every port, without reading or writing the cache file
+	"""
+	from .BLE_LWP_Device import BLE_LWP_Device
+	__set_port_info_cache(BLE_LWP_Device, None)
+
+def __set_port_info_cache(device_class, cache):
+	device_class.port_info_cache = cache
+	for device in __lego_devices__.values():
+		if isinstance(device, device_class):
+			device.port_info_cache = cache
+
+def off_bleak_callback_queue_depths():
+	"""
+	Returns { key: count } of the coroutines queued (or running) in every lane
+	that has any.  BLE_Device keys its writes as (device, characteristic uuid)
+	"""
+	return { key: len(lane) for key, lane in __off_bleak_callback_lanes__.items() }
+
 def device_for_callback_id(cb_id):
 	return __lego_devices__[__callbacks_to_device_addresses__[cb_id]]
 
-def await_function_off_bleak_callback(async_function):
+def await_function_off_bleak_callback(async_function, key=None, wait_first=None):
 	"""
 	If you try and await functions in the callback provided to set_callbacks(),
 	you'll end up blocking Bleak's messaging.  Instead, stuff them on this queue
@@ -62,8 +134,61 @@ def await_function_off_bleak_callback(async_function):
 	Bleak's queue during message processing that requires sending new GATT messages
 
 	To collapse both loops and quit async_run(), call this function with None
+
+	Coroutines queued with the same key are awaited in order, one at a time.
+	Different keys run concurrently, up to set_off_bleak_callback_concurrency()
+	at once, so a write stuck on one hub doesn't hold up the others.
+	Everything queued without a key shares a lane
+
+	wait_first is an optional coroutine awaited in the lane before
+	async_function, without taking up one of those concurrent slots.  For
+	things like waiting on a rate limit, so a lane that's just sleeping doesn't
+	hold up the other lanes
+
+	The drain wakes up as soon as something is queued, so GATT writes go out
+	without waiting on a polling interval
 	"""
-	__off_bleak_callback_queue__.put(async_function)
+	if __off_bleak_callback_queue__ is None:
+		# Picked up when the drain starts
+		__early_off_bleak_callbacks__.append((key, async_function, wait_first))
+		return
+
+	try:
+		current_loop = asyncio.get_running_loop()
+	except RuntimeError:
+		current_loop = None
+
+	if current_loop is __off_bleak_callback_loop__:
+		__off_bleak_callback_queue__.put_nowait((key, async_function, wait_first))
+	else:
+		# asyncio.Queue isn't thread-safe, so hand it to the drain's loop
+		__off_bleak_callback_loop__.call_soon_threadsafe(__off_bleak_callback_queue__.put_nowait, (key, async_function, wait_first))
+
+def __open_off_bleak_callback_queue():
+	global __off_bleak_callback_queue__
+	global __off_bleak_callback_loop__
+	global __off_bleak_callback_limit__
+
+	__off_bleak_callback_loop__ = asyncio.get_running_loop()
+	__off_bleak_callback_queue__ = asyncio.Queue()
+	__off_bleak_callback_limit__ = asyncio.Semaphore(__off_bleak_callback_concurrency__)
+	while __early_off_bleak_callbacks__:
+		__off_bleak_callback_queue__.put_nowait(__early_off_bleak_callbacks__.pop(0))
+
+def __close_off_bleak_callback_queue():
+	global __off_bleak_callback_queue__
+	global __off_bleak_callback_loop__
+
+	# Anything left over (after the None) waits for the next drain, like it used to
+	# Except more shutdowns, those would end the next drain immediately
+	if __off_bleak_callback_queue__ is not None:
+		while not __off_bleak_callback_queue__.empty():
+			leftover = __off_bleak_callback_queue__.get_nowait()
+			if leftover[1]:
+				__early_off_bleak_callbacks__.append(leftover)
+	__off_bleak_callback_queue__ = None
+	__off_bleak_callback_loop__ = None
+	__off_bleak_callback_limit__ = None
 
 def __match_up_device(bluetooth_name, dev_systype, dev_shortname):
 	global __overly_chatty_bluetooth__
@@ -157,6 +282,8 @@ async def bleak_device_dectection_callback(device, advertisement_data):
 					pass
 
 async def __bleak_scan_runner(duration=10):
+	from bleak import BleakScanner
+
 	logger = logging.getLogger(__name__)
 	global __running__
 
@@ -175,44 +302,77 @@ async def __bleak_scan_runner(duration=10):
 			await asyncio.sleep(1)
 
 		await scanner.stop()
-		await_function_off_bleak_callback(None)
 	except KeyboardInterrupt:
 		print("Recieved keyboard interrupt in Bleak runner, stopping scan.")
 
 	__running__ = False
+	# The drain only wakes up for queued items, so always hand it the sentinel
+	await_function_off_bleak_callback(None)
 	#print("Scan results...")
 	#for d in scanner.discovered_devices:
 	#	print(d)
 
+async def __run_off_bleak_callback_lane(key, lane):
+	logger = logging.getLogger(__name__)
+
+	# The coroutine stays in the lane while it's awaited so it counts in the depth
+	while lane:
+		fpair, wait_first = lane[0]
+		try:
+			if wait_first:
+				# Still holds up this lane, but not the others
+				await wait_first
+			async with __off_bleak_callback_limit__:
+				await fpair
+		except Exception as e:
+			# Used to take the whole drain down, now it just takes the one coroutine
+			logger.error(f'Off-callback coroutine {fpair} for {key} failed: {e!r}')
+			# Never got to it if the wait failed
+			fpair.close()
+		lane.popleft()
+	del __off_bleak_callback_lanes__[key]
+
 async def __drain_off_bleak_callback_calls():
 	global __running__
 	logger = logging.getLogger(__name__)
 
 	try:
 		while __running__ == True:
-			while not __off_bleak_callback_queue__.empty():
-				fpair = __off_bleak_callback_queue__.get()
-				if not fpair:
-					__running__ = False
+			key, fpair, wait_first = await __off_bleak_callback_queue__.get()
+			if not fpair:
+				__running__ = False
+			else:
+				lane = __off_bleak_callback_lanes__.get(key)
+				if lane is None:
+					lane = deque(((fpair, wait_first),))
+					__off_bleak_callback_lanes__[key] = lane
+					lane_task = asyncio.create_task(__run_off_bleak_callback_lane(key, lane))
+					__off_bleak_callback_lane_tasks__.add(lane_task)
+					lane_task.add_done_callback(__off_bleak_callback_lane_tasks__.discard)
 				else:
-					thisloop = asyncio.get_running_loop()
-					if thisloop:
-						if thisloop.is_running():
-							logger.debug(f'DRAINING OFF-CALLBACKS {fpair}')
-							await asyncio.create_task(fpair)
-			await asyncio.sleep(0.1)
+					lane.append((fpair, wait_first))
+				if logger.isEnabledFor(logging.DEBUG):
+					logger.debug(f'DRAINING OFF-CALLBACKS {fpair} (lane depth {len(lane)})')
+
+		# Let whatever was already queued finish up
+		if __off_bleak_callback_lane_tasks__:
+			await asyncio.gather(*__off_bleak_callback_lane_tasks__)
 	except KeyboardInterrupt:
 		print("Recieved keyboard interrupt, stopping callback function drain...")
 	__running__ = False
 
 async def __mainloop(run_second_duration):
 	global __running__
+	__open_off_bleak_callback_queue()
 	__running__ = True
-	await asyncio.gather(
-		__bleak_scan_runner(run_second_duration),
-		__drain_off_bleak_callback_calls()
-	)
-	__running__ = False
+	try:
+		await asyncio.gather(
+			__bleak_scan_runner(run_second_duration),
+			__drain_off_bleak_callback_calls()
+		)
+	finally:
+		__running__ = False
+		__close_off_bleak_callback_queue()
 
 def async_run(run_second_duration):
 	logger = logging.getLogger(__name__)
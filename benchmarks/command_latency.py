@@ -0,0 +1,69 @@
+import asyncio
+import time
+import statistics
+import os
+import sys
+
+# Run from anywhere, without linking the module in
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import BTLego
+from BTLego.Decoder import Decoder, LDev
+from BTLego.Hub2 import Hub2
+
+# Time from send_device_message() to the GATT write happening, going through
+# the off-callback drain the same way async_run() does, without any
+# Bluetooth hardware
+
+ITERATIONS = 200
+PRIMARY_UUID = '00001624-1212-efde-1623-785feabcd123'
+
+def lwp(*message):
+	return bytearray([len(message)+1]) + bytearray(message)
+
+# BOOST Interactive Motor on port 0
+ATTACH_MOTOR = lwp(0x0, 0x4, 0x0, 0x1, 0x26, 0x0, 0x0, 0x0, 0x0, 0x10, 0x0, 0x0, 0x0, 0x10)
+
+# Port 0 reporting Empty&Completed Idle, like a hub does after each output command
+FEEDBACK = lwp(0x0, 0x82, 0x0, 0xa)
+
+class FakeClient():
+	def __init__(self, device):
+		self.device = device
+		self.written = asyncio.Event()
+		self.write_time = None
+
+	async def write_gatt_char(self, char_uuid, payload):
+		self.write_time = time.perf_counter()
+		self.written.set()
+		await self.device._process_bt_message(Decoder.decode_payload(FEEDBACK, PRIMARY_UUID))
+
+async def run_benchmark():
+	device = Hub2(None, 'bench')
+	await device._process_bt_message(Decoder.decode_payload(ATTACH_MOTOR, PRIMARY_UUID))
+	device.client = FakeClient(device)
+	device.connected = True
+	# Measure the drain, not the write pacing
+	device.gatt_send_rate_limit = 0
+
+	# The same setup async_run() does, minus the scanner
+	getattr(BTLego, '__open_off_bleak_callback_queue')()
+	BTLego.__running__ = True
+	drain = asyncio.create_task(getattr(BTLego, '__drain_off_bleak_callback_calls')())
+
+	latencies = []
+	for i in range(ITERATIONS):
+		device.client.written.clear()
+		start = time.perf_counter()
+		device.send_device_message(LDev.MOTOR_BOOST, ('set_power', (i % 100,)))
+		await device.client.written.wait()
+		latencies.append((device.client.write_time - start) * 1000)
+
+	BTLego.await_function_off_bleak_callback(None)
+	await drain
+	getattr(BTLego, '__close_off_bleak_callback_queue')()
+
+	print(f'set_power command to GATT write over {ITERATIONS} commands:')
+	print(f'  mean {statistics.mean(latencies):8.3f}ms  median {statistics.median(latencies):8.3f}ms  max {max(latencies):8.3f}ms')
+
+asyncio.run(run_benchmark())
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import os
+import sys
+
+# Run from anywhere, without linking the module in
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import BTLego
+from BTLego.Decoder import Decoder
+from BTLego.Hub2 import Hub2
+
+# Per-packet cost of decoding a notification and routing it through the
+# device's message processing, without any Bluetooth hardware
+
+ITERATIONS = 50000
+# Best of, to keep scheduler noise out of the numbers
+REPEATS = 5
+PRIMARY_UUID = '00001624-1212-efde-1623-785feabcd123'
+
+def lwp(*message):
+	return bytearray([len(message)+1]) + bytearray(message)
+
+# Powered Up Hub IMU accelerometer on port 0x61
+ATTACH_ACCEL = lwp(0x0, 0x4, 0x61, 0x1, 0x39, 0x0, 0x0, 0x0, 0x0, 0x10, 0x0, 0x0, 0x0, 0x10)
+
+PACKETS = {
+	'port_value_single': lwp(0x0, 0x45, 0x61, 0x10, 0x0, 0xf0, 0xff, 0x20, 0x10),
+	'port_output_command_feedback': lwp(0x0, 0x82, 0x0, 0xa),
+	'hub_properties': lwp(0x0, 0x1, 0x6, 0x6, 0x50),
+}
+
+def per_packet_us(elapsed):
+	return (elapsed / ITERATIONS) * 1000000
+
+async def run_benchmark():
+	device = Hub2(None, 'bench')
+	await device._process_bt_message(Decoder.decode_payload(ATTACH_ACCEL, PRIMARY_UUID))
+
+	for name, packet in PACKETS.items():
+		decode_time = None
+		process_time = None
+		bt_message = Decoder.decode_payload(packet, PRIMARY_UUID, True)
+		for r in range(REPEATS):
+			start = time.perf_counter()
+			for i in range(ITERATIONS):
+				Decoder.decode_payload(packet, PRIMARY_UUID, True)
+			elapsed = time.perf_counter() - start
+			if decode_time is None or elapsed < decode_time:
+				decode_time = elapsed
+
+			start = time.perf_counter()
+			for i in range(ITERATIONS):
+				await device._process_bt_message(bt_message)
+				while not device.message_queue.empty():
+					device.message_queue.get()
+			elapsed = time.perf_counter() - start
+			if process_time is None or elapsed < process_time:
+				process_time = elapsed
+
+		print(f'{name:32} decode {per_packet_us(decode_time):6.2f}us  process {per_packet_us(process_time):6.2f}us')
+
+asyncio.run(run_benchmark())
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+# Cold start cost of `import BTLego`, from python -X importtime in a fresh
+# interpreter each run, and which LPF device modules got loaded along the way
+# (should be none, they load when a device with their type id attaches)
+#
+# Just for information, the timing depends too much on the machine to fail
+# on.  tests/test_imports.py checks what the lightweight imports pull in
+
+RUNS = 5
+# Modules under BTLego to show, slowest cumulative first
+TOP = 10
+# python -c imports from the working directory, so run it where BTLego is
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(statement):
+	result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+	# import time: self [us] | cumulative | imported package
+	times = {}
+	for line in result.stderr.splitlines():
+		if not line.startswith('import time:') or 'imported package' in line:
+			continue
+		self_us, cumulative_us, module = line[len('import time:'):].split('|')
+		times[module.strip()] = (int(self_us), int(cumulative_us))
+	return times
+
+def run_benchmark():
+	best = None
+	for r in range(RUNS):
+		times = import_times('import BTLego')
+		if best is None or times['BTLego'][1] < best['BTLego'][1]:
+			best = times
+
+	print(f'import BTLego: {best["BTLego"][1]/1000:8.2f}ms (best of {RUNS})')
+	modules = sorted(((cumulative, module) for module, (self_us, cumulative) in best.items() if module.startswith('BTLego.') or module == 'bleak'), reverse=True)
+	for cumulative, module in modules[:TOP]:
+		print(f'  {module:40} {cumulative/1000:8.2f}ms')
+
+	lpf_devices = [ module for module in best if module.startswith('BTLego.LPF_Devices.') and module != 'BTLego.LPF_Devices.LPF_Device' ]
+	print(f'LPF device modules imported: {len(lpf_devices)} {lpf_devices if lpf_devices else ""}')
+
+run_benchmark()
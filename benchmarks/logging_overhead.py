@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+import os
+import sys
+
+# Run from anywhere, without linking the module in
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import BTLego
+from BTLego.Hub2 import Hub2
+
+# Per-notification cost of the logging in the notification path, with the
+# module at INFO (what the cached log_debug gate skips) and at DEBUG with a
+# handler that throws everything away (what it costs when the gate is open)
+
+ITERATIONS = 20000
+# Best of, to keep scheduler noise out of the numbers
+REPEATS = 5
+PRIMARY_UUID = '00001624-1212-efde-1623-785feabcd123'
+
+def lwp(*message):
+	return bytearray([len(message)+1]) + bytearray(message)
+
+class FakeCharacteristic():
+	uuid = PRIMARY_UUID
+
+# Powered Up Hub IMU accelerometer on port 0x61
+ATTACH_ACCEL = lwp(0x0, 0x4, 0x61, 0x1, 0x39, 0x0, 0x0, 0x0, 0x0, 0x10, 0x0, 0x0, 0x0, 0x10)
+
+PACKETS = {
+	'port_value_single': lwp(0x0, 0x45, 0x61, 0x10, 0x0, 0xf0, 0xff, 0x20, 0x10),
+	'port_input_format_single': lwp(0x0, 0x47, 0x61, 0x0, 0x1, 0x0, 0x0, 0x0, 0x1),
+	'hub_properties': lwp(0x0, 0x1, 0x6, 0x6, 0x50),
+}
+
+def per_packet_us(elapsed):
+	return (elapsed / ITERATIONS) * 1000000
+
+async def time_notifications(device, packet):
+	sender = FakeCharacteristic()
+	best = None
+	for r in range(REPEATS):
+		start = time.perf_counter()
+		for i in range(ITERATIONS):
+			await device._device_events(sender, packet)
+			while not device.message_queue.empty():
+				device.message_queue.get()
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return per_packet_us(best)
+
+async def run_benchmark():
+	logger = logging.getLogger(BTLego.__name__)
+	logger.addHandler(logging.NullHandler())
+	logger.propagate = False
+
+	device = Hub2(None, 'bench')
+	await device._process_bt_message(BTLego.Decoder.decode_payload(ATTACH_ACCEL, PRIMARY_UUID))
+	# Where setLoggingLevel() finds the devices to refresh
+	getattr(BTLego, '__lego_devices__')['bench'] = device
+
+	gate_iterations = ITERATIONS * 10
+	start = time.perf_counter()
+	for i in range(gate_iterations):
+		if device.log_debug:
+			pass
+	cached = time.perf_counter() - start
+	start = time.perf_counter()
+	for i in range(gate_iterations):
+		if logger.isEnabledFor(logging.DEBUG):
+			pass
+	uncached = time.perf_counter() - start
+	print(f'debug check: log_debug {cached/gate_iterations*1000000000:6.1f}ns  logger.isEnabledFor() {uncached/gate_iterations*1000000000:6.1f}ns')
+
+	for name, packet in PACKETS.items():
+		BTLego.setLoggingLevel(logging.INFO)
+		gated = await time_notifications(device, packet)
+		BTLego.setLoggingLevel(logging.DEBUG)
+		logged = await time_notifications(device, packet)
+		print(f'{name:28} INFO {gated:6.2f}us  DEBUG {logged:6.2f}us  saved {logged-gated:6.2f}us')
+
+	if device._delivery_task:
+		device._delivery_task.cancel()
+
+asyncio.run(run_benchmark())
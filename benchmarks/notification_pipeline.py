@@ -0,0 +1,91 @@
+import asyncio
+import time
+import statistics
+import os
+import sys
+
+# Run from anywhere, without linking the module in
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BTLego.Hub2 import Hub2
+
+# What the Bleak notification handler costs with deferred_decode off (decode,
+# process and queue for the callbacks inside the handler) and on (only queue
+# the raw bytes, a consumer task does the rest), using a fake notifier that
+# fires bursts of hub property updates at a subscribed callback
+
+BURSTS = 20
+BURST_SIZE = 200
+# Seconds of work the callback does per message, like a user callback would
+CALLBACK_WORK = 0.00002
+PRIMARY_UUID = '00001624-1212-efde-1623-785feabcd123'
+
+def lwp(*message):
+	return bytearray([len(message)+1]) + bytearray(message)
+
+# Battery percentage update
+BATTERY = lwp(0x0, 0x1, 0x6, 0x6, 0x50)
+
+class FakeCharacteristic():
+	uuid = PRIMARY_UUID
+
+class FakeNotifier():
+	def __init__(self, device):
+		self.device = device
+		self.sender = FakeCharacteristic()
+		self.sent_times = []
+		self.handler_times = []
+
+	# Bleak awaits the handler once per notification, then moves on to the next one
+	async def burst(self, count):
+		for i in range(count):
+			start = time.perf_counter()
+			self.sent_times.append(start)
+			await self.device._device_events(self.sender, bytearray(BATTERY))
+			self.handler_times.append(time.perf_counter() - start)
+
+async def run_benchmark(deferred):
+	device = Hub2(None, 'bench')
+	device.deferred_decode = deferred
+
+	received_times = []
+	all_received = asyncio.Event()
+	async def callback(message):
+		received_times.append(time.perf_counter())
+		end = time.perf_counter() + CALLBACK_WORK
+		while time.perf_counter() < end:
+			pass
+		if len(received_times) == BURSTS * BURST_SIZE:
+			all_received.set()
+
+	callback_uuid = await device.register_callback(callback)
+	await device.subscribe_to_messages_on_callback(callback_uuid, 'property')
+
+	notifier = FakeNotifier(device)
+	start = time.perf_counter()
+	for b in range(BURSTS):
+		await notifier.burst(BURST_SIZE)
+		# Let the event loop breathe between bursts, like the radio does
+		await asyncio.sleep(0)
+	await all_received.wait()
+	elapsed = time.perf_counter() - start
+
+	latencies = [(r - s) * 1000 for s, r in zip(notifier.sent_times, received_times)]
+	handler_us = [t * 1000000 for t in notifier.handler_times]
+	print(f'deferred_decode={deferred}:')
+	print(f'  handler    mean {statistics.mean(handler_us):8.2f}us  max {max(handler_us):8.2f}us')
+	print(f'  latency    mean {statistics.mean(latencies):8.3f}ms  median {statistics.median(latencies):8.3f}ms  max {max(latencies):8.3f}ms')
+	print(f'  throughput {len(received_times)/elapsed:8.0f} messages/s')
+	if deferred:
+		print(f'  longest wait in notification_queue {device.notification_lag_max*1000:.3f}ms, {device.notifications_dropped} dropped')
+
+	if device._delivery_task:
+		device._delivery_task.cancel()
+	if device._notification_task:
+		device._notification_task.cancel()
+
+async def main():
+	await run_benchmark(False)
+	await run_benchmark(True)
+
+asyncio.run(main())
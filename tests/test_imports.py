@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def modules_after(statement):
+	"""
+	sys.modules after running statement in a fresh interpreter, since this one
+	has probably imported everything already
+	"""
+	result = subprocess.run([sys.executable, '-c', f'{statement}\nimport sys\nprint("\\n".join(sys.modules))'], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+	return set(result.stdout.split())
+
+class LightweightImportTest(unittest.TestCase):
+
+	# Should be usable without Bleak or any device classes
+	lightweight_imports = ('BTLego', 'BTLego.Decoder', 'BTLego.MarioScanspace')
+
+	def heavy_modules(self, modules):
+		import BTLego
+		heavy = set(('bleak', 'BTLego.BLE_Device', 'BTLego.BLE_LWP_Device', 'BTLego.BLE_WeDo'))
+		heavy.update(f'BTLego.{classname}' for classname in BTLego.__device_classnames__)
+		return sorted(module for module in modules if module in heavy or (module.startswith('BTLego.LPF_Devices.') and module != 'BTLego.LPF_Devices.LPF_Device'))
+
+	def test_lightweight_imports(self):
+		for lightweight_import in self.lightweight_imports:
+			with self.subTest(lightweight_import):
+				self.assertEqual(self.heavy_modules(modules_after(f'import {lightweight_import}')), [])
+
+class HubClassBindingTest(unittest.TestCase):
+
+	def assertBoundToClass(self, statement):
+		modules = modules_after(f'{statement}\nimport BTLego\nassert isinstance(BTLego.Mario, type), BTLego.Mario\nassert BTLego.Mario.__module__ == "BTLego.Mario"')
+		self.assertIn('BTLego.Mario', modules)
+
+	def test_import_submodule(self):
+		self.assertBoundToClass('import BTLego.Mario')
+
+	def test_from_submodule_import(self):
+		self.assertBoundToClass('from BTLego.Mario import Mario\nimport BTLego\nassert BTLego.Mario is Mario')
+
+	def test_attribute_then_import(self):
+		self.assertBoundToClass('import BTLego\nMario = BTLego.Mario\nimport BTLego.Mario\nassert BTLego.Mario is Mario')
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,13 @@
+import unittest
+
+from BTLego.LPF_Devices.LPF_Device import lpf_message_types, scan_lpf_message_types
+
+class LPFMessageTypesTest(unittest.TestCase):
+
+	def test_registry_matches_device_classes(self):
+		# lpf_message_types is kept by hand so hubs don't have to import
+		# every device class to validate a subscription
+		self.assertEqual(set(scan_lpf_message_types()), set(lpf_message_types))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from BTLego.Message import MessageType, Message, NOOP, device_message_types, unsubscribable_message_types, message_type_ids
+from BTLego.LPF_Devices.LPF_Device import lpf_message_types
+
+class MessageTypeTest(unittest.TestCase):
+
+	def test_covers_every_message_type(self):
+		for message_type in device_message_types + lpf_message_types + unsubscribable_message_types:
+			self.assertIn(message_type, message_type_ids)
+
+	def test_ids_are_stable(self):
+		# Stored by callers, so these must never change
+		self.assertEqual(MessageType.event, 0x1)
+		self.assertEqual(MessageType.alt_event, 0x20)
+		self.assertEqual(MessageType.voltage, 0x4d)
+		self.assertEqual(MessageType.idk_, 0x4e)
+		self.assertEqual(MessageType.imu, 0x80)
+
+	def test_message_is_a_tuple(self):
+		message_type, key, value = Message._make(('motor_pos', 'pos', 10))
+		self.assertEqual((message_type, key, value), ('motor_pos', 'pos', 10))
+		self.assertIs(Message._make(('motor_pos', 'pos', 10)).type_id, MessageType.motor_pos)
+		self.assertIsNone(NOOP.type_id)
+
+if __name__ == '__main__':
+	unittest.main()